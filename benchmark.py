@@ -0,0 +1,266 @@
+import gc
+import csv
+import json
+import os
+import sys
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+import synthdata
+
+def read_column(path, column):
+    return pd.read_csv(path, dtype=str, keep_default_na=False, usecols=[column])[column]
+
+def bench_extract_salary(paths, options):
+    import preprocess
+    salaries = read_column(paths['processed_job_data.csv'], 'Salary').tolist()
+
+    def run():
+        for salary in salaries:
+            preprocess.extract_salary(salary)
+        return len(salaries)
+    return run
+
+def bench_normalize_salary_column(paths, options):
+    import preprocess
+    salaries = read_column(paths['processed_job_data.csv'], 'Salary')
+    return lambda: len(preprocess.normalize_salary_column(salaries))
+
+def bench_standardize_location(paths, options):
+    import preprocess
+    import locations
+    values = read_column(paths['processed_job_data.csv'], 'Location').tolist()
+
+    def run():
+        locations.resolve_location.cache_clear()  # Measure a cold run, not a previous benchmark's cache
+        locations._known_locations.clear()
+        for value in values:
+            preprocess.standardize_location(value)
+        return len(values)
+    return run
+
+def bench_standardize_location_column(paths, options):
+    import locations
+    values = read_column(paths['processed_job_data.csv'], 'Location')
+
+    def run():
+        locations.resolve_location.cache_clear()
+        locations._known_locations.clear()
+        return len(locations.standardize_location_column(values))
+    return run
+
+def bench_filter_row_skills(paths, options):
+    import removeIrrelevantFeatures
+    with open(paths['data.csv'], newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+
+    def run():
+        for row in rows:
+            removeIrrelevantFeatures.filter_row_skills(dict(row))
+        return len(rows)
+    return run
+
+def count_rows(path):
+    """Rows of a CSV file, counted chunk by chunk so the file is never held in memory."""
+    return sum(len(chunk) for chunk in pd.read_csv(path, dtype=str, usecols=[0], chunksize=100_000))
+
+def bench_count_skills(paths, options):
+    import removeIrrelevantFeatures
+    path = paths['data.csv']
+    rows = count_rows(path)
+
+    def run():
+        removeIrrelevantFeatures.count_skills(path)
+        return rows
+    return run
+
+def bench_top_skills(paths, options):
+    # main.get_top_5_skills was replaced by the skill cube; this measures the cube build and top-5 query
+    from compactdata import load_compact
+    from skillcube import SkillCube
+    dataset = load_compact(paths['filtered_data.csv'])
+
+    def run():
+        SkillCube.from_compact(dataset).top_k_by(5, 'Title')
+        return len(dataset)
+    return run
+
+def bench_load_compact(paths, options):
+    from compactdata import load_compact
+    return lambda: len(load_compact(paths['filtered_data.csv']))
+
+def bench_build_skill_matrix(paths, options):
+    from features import SkillVocabulary, build_skill_matrix
+    skills = read_column(paths['filtered_data.csv'], 'Skills')
+    skill_lists = [[skill.strip() for skill in value.split(';') if skill.strip()] for value in skills]
+    return lambda: build_skill_matrix(skill_lists, SkillVocabulary()).shape[0]
+
+def training_data(paths, options):
+    """The skill matrix and salaries of the (sampled) filtered data, and the first --fit-rows rows to fit on."""
+    from compactdata import load_compact
+    dataset = load_compact(paths['filtered_data.csv'])
+    rows = min(len(dataset), options.fit_rows)
+    X, y = dataset.to_csr(), dataset.salary.astype('float64')
+    return X, X[:rows], y[:rows]
+
+def bench_rf_fit(paths, options):
+    from sklearn.ensemble import RandomForestRegressor
+    _, X, y = training_data(paths, options)
+
+    def run():
+        RandomForestRegressor(n_estimators=options.trees, random_state=42, n_jobs=-1).fit(X, y)
+        return X.shape[0]
+    return run
+
+def bench_rf_predict(paths, options):
+    from sklearn.ensemble import RandomForestRegressor
+    X_all, X, y = training_data(paths, options)
+    model = RandomForestRegressor(n_estimators=options.trees, random_state=42, n_jobs=-1).fit(X, y)
+    return lambda: len(model.predict(X_all))
+
+# Benchmark name -> setup(paths, options) returning the function to time (which returns the rows it processed)
+BENCHMARKS = {
+    'extract_salary': bench_extract_salary,
+    'normalize_salary_column': bench_normalize_salary_column,
+    'standardize_location': bench_standardize_location,
+    'standardize_location_column': bench_standardize_location_column,
+    'filter_row_skills': bench_filter_row_skills,
+    'count_skills': bench_count_skills,
+    'top_skills': bench_top_skills,
+    'load_compact': bench_load_compact,
+    'build_skill_matrix': bench_build_skill_matrix,
+    'rf_fit': bench_rf_fit,
+    'rf_predict': bench_rf_predict,
+}
+
+# Benchmarks timing a read of the whole file. Every other benchmark runs on the first --sample-rows rows,
+# because its setup holds its input in memory (as Python strings, dicts or a skill matrix).
+WHOLE_FILE_BENCHMARKS = {'count_skills', 'load_compact'}
+
+def measure(run, memory=True):
+    """
+    Time `run()`, then (if `memory`) run it again under tracemalloc for the peak Python/numpy allocation.
+    Tracing slows Python code down, so the timing comes from the untraced run.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        tracemalloc.stop()
+    return rows, seconds, peak_mb
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def sample_files(paths, directory, rows):
+    """Copies of the files in `paths` cut to their first `rows` rows, written once under `directory`/sample-<rows>/."""
+    sample_dir = os.path.join(directory, f"sample-{rows}")
+    os.makedirs(sample_dir, exist_ok=True)
+    samples = {}
+    for name, path in paths.items():
+        samples[name] = os.path.join(sample_dir, name)
+        if not os.path.exists(samples[name]):
+            # The synthetic rows are drawn at random, so the first rows are a random sample
+            sample = pd.read_csv(path, dtype=str, keep_default_na=False, nrows=rows)
+            sample.to_csv(samples[name], index=False, lineterminator='\r\n')
+    return samples
+
+def run_benchmarks(size, names, options):
+    """Run the named benchmarks on the synthetic data of one size (generated first if missing)."""
+    directory = synthdata.dataset_dir(size, options.data_dir)
+    if not all(os.path.exists(os.path.join(directory, name)) for name in synthdata.SOURCE_FILES):
+        synthdata.generate(synthdata.parse_size(size), directory)
+    paths = {name: os.path.join(directory, name) for name in synthdata.SOURCE_FILES}
+    sampled = paths
+    if synthdata.parse_size(size) > options.sample_rows and set(names) - WHOLE_FILE_BENCHMARKS:
+        sampled = sample_files(paths, directory, options.sample_rows)
+
+    results = []
+    for name in names:
+        run = BENCHMARKS[name](paths if name in WHOLE_FILE_BENCHMARKS else sampled, options)
+        rows, seconds, peak_mb = measure(run, options.memory)
+        result = {
+            "benchmark": name,
+            "size": size,
+            "rows": int(rows),
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(rows / seconds, 1) if seconds else None,
+            "peak_mb": peak_mb,
+        }
+        print(f"{size:>5} {name:<28} {rows:>10} rows {seconds:9.3f}s {result['rows_per_second'] or 0:>14,.0f} rows/s"
+              + (f" {peak_mb:9.1f} MB peak" if peak_mb is not None else ""), file=sys.stderr)
+        results.append(result)
+    return results
+
+def compare(old_file, new_results):
+    """Print throughput and peak memory of `new_results` relative to a previous benchmark JSON file."""
+    with open(old_file, encoding='utf-8') as file:
+        old = {(r['benchmark'], r['size']): r for r in json.load(file)['results']}
+    for result in new_results:
+        before = old.get((result['benchmark'], result['size']))
+        if not before or not before['rows_per_second'] or not result['rows_per_second']:
+            continue
+        speed = result['rows_per_second'] / before['rows_per_second']
+        line = f"{result['size']:>5} {result['benchmark']:<28} throughput {speed:5.2f}x"
+        if before.get('peak_mb') and result.get('peak_mb'):
+            line += f", peak memory {result['peak_mb'] / before['peak_mb']:5.2f}x"
+        flag = "  ⚠ regression" if speed < 0.9 else ""
+        print(line + flag, file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths on synthetic job-posting data.")
+    parser.add_argument("--sizes", nargs="+", default=['10k'], help="Data sizes: 10k, 100k, 1m, 10m or a row count")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all)")
+    parser.add_argument("--data-dir", default='bench_data', help="Where synthetic data is generated and cached")
+    parser.add_argument("--sample-rows", type=int, default=200_000,
+                        help="Rows the per-row benchmarks run on (all but count_skills and load_compact, "
+                             "which read the whole file)")
+    parser.add_argument("--fit-rows", type=int, default=20000, help="Rows used to fit the RandomForest benchmarks")
+    parser.add_argument("--trees", type=int, default=100, help="Trees in the RandomForest benchmarks")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the peak memory pass")
+    parser.add_argument("--output", default='-', help="JSON results file (default: stdout)")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to compare against")
+    options = parser.parse_args()
+
+    results = []
+    for size in options.sizes:
+        results.extend(run_benchmarks(size, options.only, options))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    if options.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"✅ Results saved to '{options.output}'", file=sys.stderr)
+
+    if options.compare:
+        compare(options.compare, results)
+
+if __name__ == "__main__":
+    main()
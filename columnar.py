@@ -0,0 +1,143 @@
+import os
+import time
+import argparse
+import pandas as pd
+
+# File extensions read and written as columnar tables instead of CSV
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+# Columns stored as list<string> (semicolon-joined in CSV) and as dictionary-encoded strings
+LIST_COLUMNS = ('Skills',)
+CATEGORY_COLUMNS = ('Title', 'Location')
+FLOAT_COLUMNS = ('Salary',)
+
+def is_columnar(path):
+    """True if `path` has a Parquet or Arrow extension."""
+    return path.lower().endswith(PARQUET_EXTENSIONS + ARROW_EXTENSIONS)
+
+def split_list(value):
+    """Split a semicolon-joined CSV value into a list; empty or missing values become None."""
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(';') if part.strip()] or None
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return list(value) or None
+
+def join_list(value):
+    """Join a list value back into the semicolon-separated CSV form."""
+    if value is None or isinstance(value, (str, float)):
+        return value
+    return '; '.join(value)
+
+def is_numeric(values):
+    """True if every non-blank value parses as a number (parsed salaries, not raw salary text)."""
+    text = values.dropna().astype(str).str.strip()
+    text = text[text != '']
+    return bool(pd.to_numeric(text, errors='coerce').notna().all())
+
+def to_arrow(df, list_columns=LIST_COLUMNS, category_columns=CATEGORY_COLUMNS, float_columns=FLOAT_COLUMNS):
+    """Convert a DataFrame to an Arrow table with list, dictionary-encoded and float64 columns."""
+    import pyarrow as pa
+
+    arrays = {}
+    for column in df.columns:
+        values = df[column]
+        if column in list_columns:
+            arrays[column] = pa.array([split_list(value) for value in values], type=pa.list_(pa.string()))
+        elif column in category_columns:
+            arrays[column] = pa.array(values.astype(object).where(values.notna(), None),
+                                      type=pa.string()).dictionary_encode()
+        elif column in float_columns and is_numeric(values):
+            arrays[column] = pa.array(pd.to_numeric(values, errors='coerce'), type=pa.float64(), from_pandas=True)
+        else:
+            arrays[column] = pa.array(values.astype(object).where(values.notna(), None), type=pa.string())
+    return pa.table(arrays)
+
+def write_table(df, path, list_columns=LIST_COLUMNS, category_columns=CATEGORY_COLUMNS, float_columns=FLOAT_COLUMNS):
+    """
+    Write a DataFrame as Parquet, Arrow IPC or CSV depending on the extension of `path`.
+    CSV output keeps the original format (semicolon-joined skills, CRLF line endings).
+    """
+    if not is_columnar(path):
+        df = df.copy()
+        for column in list_columns:
+            if column in df.columns:
+                df[column] = df[column].map(join_list)
+        df.to_csv(path, index=False, lineterminator='\r\n')
+        return
+
+    table = to_arrow(df, list_columns, category_columns, float_columns)
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+        # Uncompressed so readers can memory-map the file instead of decompressing it
+        feather.write_feather(table, path, compression='uncompressed')
+
+def read_arrow(path, columns=None):
+    """Read only `columns` of a Parquet or Arrow IPC file as an Arrow table, memory-mapping the file."""
+    import pyarrow as pa
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns, memory_map=True)
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+def read_table(path, columns=None, **csv_kwargs):
+    """
+    Read a Parquet, Arrow IPC or CSV file as a DataFrame, loading only `columns`.
+    Columnar files return categorical Title/Location and skills as arrays of strings;
+    CSV files are read with pandas.read_csv(**csv_kwargs) and keep skills as text.
+    """
+    if not is_columnar(path):
+        return pd.read_csv(path, usecols=columns, **csv_kwargs)
+    return read_arrow(path, columns).to_pandas()
+
+def read_table_chunks(path, columns=None, chunk_size=100_000):
+    """
+    Yield DataFrames of at most `chunk_size` rows, so memory use depends on the chunk size, not the file size.
+    Parquet is read batch by batch, Arrow IPC is memory-mapped and sliced, CSV is read with all-text
+    columns ('' for missing values). Skills are lists for columnar files and semicolon-joined text for CSV.
+    """
+    if not is_columnar(path):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size, dtype=str, keep_default_na=False)
+        return
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_size, columns=columns)
+    else:
+        batches = read_arrow(path, columns).to_batches(max_chunksize=chunk_size)
+    for batch in batches:
+        yield batch.to_pandas()
+
+def read_text_table(path, columns=None):
+    """
+    Read a raw scraped table with every column as plain text and '' for missing values,
+    whatever the file format.
+    """
+    df = read_table(path, columns, dtype=str, keep_default_na=False)
+    return df.astype(object).where(df.notna(), '')
+
+def convert(input_file, output_file):
+    """Convert a table between CSV, Parquet and Arrow IPC."""
+    csv_kwargs = {} if is_columnar(input_file) else {'dtype': {'Title': str, 'Location': str, 'Skills': str}}
+    df = read_table(input_file, **csv_kwargs)
+    write_table(df, output_file)
+    return len(df)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert pipeline tables between CSV, Parquet and Arrow.")
+    parser.add_argument("input", help="Input file (.csv, .parquet or .arrow)")
+    parser.add_argument("output", help="Output file (.csv, .parquet or .arrow)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = convert(args.input, args.output)
+    print(f"✅ Converted {rows} rows from '{args.input}' ({os.path.getsize(args.input) / 1e6:.2f} MB) "
+          f"to '{args.output}' ({os.path.getsize(args.output) / 1e6:.2f} MB) in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import columnar
+from features import SkillVocabulary
+from skillaliases import get_canonicalizer, print_reduction_report
+from skillfilter import get_skill_filter
+
+COLUMNS = ['Title', 'Location', 'Skills', 'Salary']
+
+class CompactDataset:
+    """
+    Job postings held column-wise: categorical Title and Location, float32 salaries and every row's
+    skills as int32 IDs in one flat array (row i's skills are skill_codes[skill_offsets[i]:skill_offsets[i + 1]]).
+    Skill IDs are columns of the interned SkillVocabulary.
+    """
+    def __init__(self, title, location, salary, skill_codes, skill_offsets, vocab, raw_features=0):
+        self.title = title
+        self.location = location
+        self.salary = salary
+        self.skill_codes = skill_codes
+        self.skill_offsets = skill_offsets
+        self.vocab = vocab
+        self.raw_features = raw_features
+
+    def __len__(self):
+        return len(self.salary)
+
+    def row_skills(self, i):
+        """Returns the skill names of row `i`."""
+        skills = self.vocab.skills
+        return [skills[code] for code in self.skill_codes[self.skill_offsets[i]:self.skill_offsets[i + 1]]]
+
+    def skill_lengths(self):
+        return np.diff(self.skill_offsets)
+
+    def to_csr(self):
+        """The skill matrix as CSR, sharing the code and offset arrays instead of copying them."""
+        from scipy import sparse
+        data = np.ones(len(self.skill_codes), dtype=np.float32)
+        return sparse.csr_matrix((data, self.skill_codes, self.skill_offsets), shape=(len(self), len(self.vocab)))
+
+    def frame(self):
+        """Title, Location and Salary as a DataFrame (for plotting); skills stay in the flat arrays."""
+        return pd.DataFrame({'Title': self.title, 'Location': self.location, 'Salary': self.salary})
+
+    def feature_reduction(self):
+        canonical = len(np.unique(self.skill_codes))
+        return {"raw_features": self.raw_features, "canonical_features": canonical,
+                "removed": self.raw_features - canonical}
+
+    def memory_report(self):
+        """Bytes held by each column."""
+        report = {
+            "title": int(self.title.codes.nbytes + self.title.categories.memory_usage(deep=True)),
+            "location": int(self.location.codes.nbytes + self.location.categories.memory_usage(deep=True)),
+            "salary": self.salary.nbytes,
+            "skill_codes": self.skill_codes.nbytes,
+            "skill_offsets": self.skill_offsets.nbytes,
+            "vocabulary": sum(len(skill) + 49 for skill in self.vocab.skills),  # Approximate str object size
+        }
+        report["total"] = sum(report.values())
+        return report
+
+    def print_memory_report(self, label="Dataset"):
+        report = self.memory_report()
+        print(f"{label}: {len(self)} rows, {len(self.skill_codes)} skills, {len(self.vocab)} distinct skills, "
+              f"{report['total'] / 1e6:.2f} MB ({report['total'] / max(len(self), 1):.0f} bytes per row)")
+        for column, size in report.items():
+            if column != "total":
+                print(f"  {column}: {size / 1e6:.2f} MB")
+        return report
+
+def read_arrow_table(path, columns=COLUMNS):
+    """Read the columns of a CSV, Parquet or Arrow file as an Arrow table (CSV is parsed by Arrow, not pandas)."""
+    if columnar.is_columnar(path):
+        return columnar.read_arrow(path, columns)
+    from pyarrow import csv as pa_csv
+    convert_options = pa_csv.ConvertOptions(include_columns=columns, strings_can_be_null=True,
+                                            column_types={'Title': pa.string(), 'Location': pa.string(),
+                                                          'Skills': pa.string(), 'Salary': pa.float64()})
+    return pa_csv.read_csv(path, convert_options=convert_options)
+
+def to_categorical(array):
+    """Arrow string (or dictionary) array -> pandas Categorical, without per-row Python strings."""
+    encoded = pc.dictionary_encode(array.cast(pa.string()) if pa.types.is_dictionary(array.type) else array)
+    return pd.Categorical.from_codes(encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32),
+                                     categories=encoded.dictionary.to_pylist())
+
+def load_compact(path, vocab=None, titles=None, skill_filter=None, canonicalizer=None):
+    """
+    Load a CSV, Parquet or Arrow job table into a CompactDataset.
+    Rows with a missing column are dropped (like DataFrame.dropna) and, if `titles` is given, only those
+    job titles are kept. Skills go through the experience filter and canonicalization once per distinct
+    raw skill, not once per row, and are interned into `vocab`.
+    """
+    vocab = vocab if vocab is not None else SkillVocabulary()
+    skill_filter = skill_filter or get_skill_filter()
+    canonicalizer = canonicalizer or get_canonicalizer()
+
+    table = read_arrow_table(path).drop_null()
+    title = pc.utf8_trim_whitespace(table['Title'].combine_chunks().cast(pa.string()))
+    if titles is not None:
+        keep = pc.is_in(title, value_set=pa.array(list(titles)))
+        table = table.filter(keep)
+        title = title.filter(keep)
+
+    skills = table['Skills'].combine_chunks()
+    if not pa.types.is_list(skills.type):
+        skills = pc.split_pattern(skills, pattern=';')
+    lengths = pc.list_value_length(skills).to_numpy(zero_copy_only=False)
+    flat = pc.utf8_trim_whitespace(pc.list_flatten(skills))
+
+    # Resolve each distinct raw skill once: experience keywords and dropped fragments map to -1
+    encoded = pc.dictionary_encode(flat)
+    raw_skills = encoded.dictionary.to_pylist()
+    experience_keywords = skill_filter.experience_keywords
+    resolved = np.full(len(raw_skills), -1, dtype=np.int64)
+    for i, raw in enumerate(raw_skills):
+        if raw and raw.lower() not in experience_keywords:
+            canonical = canonicalizer.canonical(raw)
+            if canonical:
+                resolved[i] = vocab.add(canonical)
+    codes = resolved[encoded.indices.to_numpy(zero_copy_only=False)]
+
+    # Drop filtered skills and duplicates within a row, then rebuild the offsets
+    rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+    valid = codes >= 0
+    pairs = np.sort(rows[valid] * len(vocab) + codes[valid])
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+    pair_rows = pairs // max(len(vocab), 1)
+    skill_codes = (pairs - pair_rows * len(vocab)).astype(np.int32)
+    skill_offsets = np.searchsorted(pair_rows, np.arange(len(lengths) + 1)).astype(np.int64)
+
+    return CompactDataset(
+        title=to_categorical(title),
+        location=to_categorical(table['Location'].combine_chunks()),
+        salary=table['Salary'].cast(pa.float32()).to_numpy(zero_copy_only=False),
+        skill_codes=skill_codes,
+        skill_offsets=skill_offsets,
+        vocab=vocab,
+        raw_features=sum(1 for raw in raw_skills if raw),
+    )
+
+def print_compact_reduction(dataset):
+    return print_reduction_report(dataset.feature_reduction())
+
+def object_frame_bytes(path):
+    """Memory of the same data loaded the original way: read_csv plus Python lists of skills."""
+    df = columnar.read_table(path, columns=COLUMNS).dropna()
+    df['Skills'] = df['Skills'].map(lambda value: value.split(';') if isinstance(value, str) else list(value))
+    return int(df.memory_usage(deep=True).sum()
+               + sum(sum(len(skill) + 49 for skill in skills) for skills in df['Skills']))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load job data into the compact representation and report its memory.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="CSV, Parquet or Arrow file")
+    parser.add_argument("--compare", action="store_true", help="Also measure the original DataFrame of Python lists")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    dataset = load_compact(args.file)
+    print(f"Loaded in {time.perf_counter() - start:.2f}s")
+    print_compact_reduction(dataset)
+    report = dataset.print_memory_report()
+    if args.compare:
+        baseline = object_frame_bytes(args.file)
+        print(f"Original DataFrame with Python lists: {baseline / 1e6:.2f} MB "
+              f"({baseline / report['total']:.1f}x the compact dataset)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import re
+import zlib
+import argparse
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+import numpy as np
+import pandas as pd
+import columnar
+
+# Query parameters that only track where a click came from and never change the posting
+TRACKING_PARAMS = {
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'utm_id',
+    'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'referrer', 'src',
+    'tk', 'from', 'sr', 'searchid', 'position', 'isp',
+}
+
+# Job boards whose posting URLs carry a stable job ID: host -> (pattern of the ID, canonical URL template)
+JOB_ID_PATTERNS = {
+    'simplyhired.com': (re.compile(r'/job/([A-Za-z0-9_-]+)'), 'https://www.simplyhired.com/job/{}'),
+}
+
+def canonical_url(url):
+    """
+    Canonical form of a job URL, so the same posting reached from different searches compares equal:
+    known job boards are reduced to their job ID; otherwise the scheme and host are lowercased, `www.`,
+    the fragment, trailing slashes and tracking parameters are removed, and the remaining parameters sorted.
+    The scheme is kept, so the canonical URL can still be fetched.
+    """
+    url = (url or '').strip()
+    parts = urlparse(url)
+    if not parts.netloc:
+        return url
+    host = parts.netloc.lower()
+    host = host[4:] if host.startswith('www.') else host
+
+    board = JOB_ID_PATTERNS.get(host)
+    if board:
+        match = board[0].search(parts.path)
+        if match:
+            return board[1].format(match.group(1))
+
+    params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if name.lower() not in TRACKING_PARAMS)
+    return urlunparse((parts.scheme.lower(), host, parts.path.rstrip('/') or '/', '', urlencode(params), ''))
+
+def record_tokens(title, location, salary, skills):
+    """
+    The shingles a posting is fingerprinted on: title words, location, salary rounded to $1000
+    and each skill (a list), tagged by field so a skill can't match a title word.
+    """
+    tokens = {f"t:{word}" for word in str(title or '').lower().split()}
+    tokens.add(f"l:{str(location or '').strip().lower()}")
+    tokens.add(f"s:{'none' if salary is None or salary != salary else round(float(salary) / 1000)}")
+    tokens.update(f"k:{skill.lower()}" for skill in skills)
+    return tokens
+
+def minhash_signatures(token_sets, num_perm=64, seed=42):
+    """
+    MinHash signatures (num_records x num_perm uint32) of a list of token sets.
+    Tokens are hashed once per distinct token; each permutation is one vectorized pass over all tokens.
+    """
+    prime = (1 << 31) - 1
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, prime, num_perm, dtype=np.uint64)
+    b = rng.integers(0, prime, num_perm, dtype=np.uint64)
+
+    lengths = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=len(token_sets))
+    codes, distinct = pd.factorize(pd.Series([token for tokens in token_sets for token in tokens], dtype=object))
+    token_hashes = np.array([zlib.crc32(token.encode('utf-8')) % prime for token in distinct], dtype=np.uint64)
+    hashes = token_hashes[codes]
+
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    signatures = np.full((len(token_sets), num_perm), prime, dtype=np.uint32)
+    nonempty = lengths > 0
+    for i in range(num_perm):
+        permuted = (a[i] * hashes + b[i]) % prime
+        if len(permuted):
+            signatures[nonempty, i] = np.minimum.reduceat(permuted, starts[nonempty])
+    return signatures
+
+def near_duplicates(signatures, threshold=0.8, bands=8, eligible=None, groups=None):
+    """
+    Boolean array marking records that are near-duplicates of an earlier record.
+    Candidates share all rows of at least one LSH band (and the same `groups` code, if given); a candidate
+    is a duplicate when the share of equal MinHash values (the estimated Jaccard similarity) with the
+    band's first record is >= `threshold`.
+    Records where `eligible` is False are never marked nor used as the record to compare against.
+    """
+    count, num_perm = signatures.shape
+    rows = num_perm // bands
+    eligible = np.ones(count, dtype=bool) if eligible is None else np.asarray(eligible, dtype=bool)
+    groups = np.zeros(count, dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    candidates = np.flatnonzero(eligible)
+    duplicate = np.zeros(count, dtype=bool)
+    multipliers = np.random.default_rng(0).integers(1, 1 << 62, rows + 1, dtype=np.uint64) | np.uint64(1)
+
+    for band in range(bands):
+        block = signatures[candidates, band * rows:(band + 1) * rows].astype(np.uint64)
+        block = np.column_stack((block, groups[candidates].astype(np.uint64)))
+        keys = (block * multipliers).sum(axis=1)  # Wrapping uint64 arithmetic, used only as a band hash
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        first = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        leaders = candidates[order[np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))]]
+        members = candidates[order]
+        pairs = (members != leaders) & (groups[members] == groups[leaders])
+        members, leaders = members[pairs], leaders[pairs]
+        similarity = (signatures[members] == signatures[leaders]).mean(axis=1)
+        duplicate[members[similarity >= threshold]] = True
+    return duplicate
+
+def posting_signatures(df, min_skills=3, num_perm=64):
+    """MinHash signatures of the rows of a Title/Location/Salary/Skills frame, and which rows have `min_skills` skills."""
+    skills = df['Skills'].map(lambda value: columnar.split_list(value) or [])
+    token_sets = [record_tokens(title, location, salary, row_skills) for title, location, salary, row_skills
+                  in zip(df['Title'], df['Location'], pd.to_numeric(df['Salary'], errors='coerce'), skills)]
+    return minhash_signatures(token_sets, num_perm), skills.map(len).to_numpy() >= min_skills
+
+def near_duplicate_mask(df, threshold=0.8, min_skills=3, num_perm=64, bands=8):
+    """
+    Boolean Series marking rows of a Title/Location/Salary/Skills frame that repeat an earlier posting.
+    Only rows with the same title and location are compared, so one opening advertised in several
+    locations stays one row per location. Rows with fewer than `min_skills` skills (e.g. FlexJobs,
+    which has none) are always kept: title, location and salary alone can't tell a repost from a
+    different job with the same pay.
+    """
+    signatures, eligible = posting_signatures(df, min_skills, num_perm)
+    groups, _ = pd.factorize(pd.MultiIndex.from_arrays([df['Title'].astype(str), df['Location'].astype(str)]))
+    duplicate = near_duplicates(signatures, threshold, bands, eligible=eligible, groups=groups)
+    return pd.Series(duplicate, index=df.index)
+
+class NearDuplicateIndex:
+    """
+    near_duplicate_mask for a table read chunk by chunk: each row is compared with the first row of
+    every band key seen so far, in this or an earlier chunk, so a stream loses the same rows as the
+    whole table would. Memory grows with the number of distinct band keys, not with the chunk size.
+    """
+    def __init__(self, threshold=0.8, min_skills=3, num_perm=64, bands=8):
+        self.threshold = threshold
+        self.min_skills = min_skills
+        self.num_perm = num_perm
+        self.rows = num_perm // bands
+        self._leaders = [{} for _ in range(bands)]  # Per band: (title, location, band values) -> first signature
+
+    def mask(self, df):
+        """Boolean Series marking rows of the chunk `df` that repeat a posting of this or an earlier chunk."""
+        signatures, eligible = posting_signatures(df, self.min_skills, self.num_perm)
+        titles, places = df['Title'].astype(str).to_numpy(), df['Location'].astype(str).to_numpy()
+        duplicate = np.zeros(len(df), dtype=bool)
+        for i in np.flatnonzero(eligible):
+            signature = signatures[i]
+            for band, leaders in enumerate(self._leaders):
+                key = (titles[i], places[i], signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                leader = leaders.setdefault(key, signature)
+                if leader is not signature and (leader == signature).mean() >= self.threshold:
+                    duplicate[i] = True
+        return pd.Series(duplicate, index=df.index)
+
+def drop_near_duplicates(df, **kwargs):
+    """Returns `df` without the rows that repeat an earlier posting, and the number of rows dropped."""
+    duplicate = near_duplicate_mask(df, **kwargs)
+    return df[~duplicate.to_numpy()], int(duplicate.sum())
+
+def main():
+    parser = argparse.ArgumentParser(description="Report (or remove) near-duplicate job postings in a table.")
+    parser.add_argument("file", nargs="?", default='data.csv', help="CSV, Parquet or Arrow file with Title, Location, Salary and Skills")
+    parser.add_argument("--output", default=None, help="Write the table without near-duplicates to this file")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity to count as a duplicate")
+    parser.add_argument("--show", type=int, default=5, help="Number of duplicate rows to print")
+    args = parser.parse_args()
+
+    df = columnar.read_table(args.file, columns=['Title', 'Location', 'Skills', 'Salary'])
+    duplicate = near_duplicate_mask(df, threshold=args.threshold)
+    print(f"{int(duplicate.sum())} of {len(df)} rows are near-duplicates of an earlier posting.")
+    print(df[duplicate.to_numpy()].head(args.show).to_string())
+    if args.output:
+        columnar.write_table(df[~duplicate.to_numpy()], args.output)
+        print(f"✅ Saved {int((~duplicate).sum())} rows to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from modelregistry import model_key
+from skillaliases import ALIASES_FILE
+from skillfilter import RULES_FILE
+from training import split_cores
+
+# Cached folds, SelectKBest scores and per-fold results, one subdirectory per data key
+EVAL_DIR = "evaluation"
+
+JOB_TITLES = ['Software Engineering', 'Data Scientist', 'AI/ML']
+
+def model_families():
+    """
+    Model name -> (estimator factory, SelectKBest k or None for all features, needs a dense matrix).
+    "linear" and "random_forest_k30" are the two models described in the README.
+    """
+    from sklearn.dummy import DummyRegressor
+    from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+
+    return {
+        'mean': (lambda: DummyRegressor(strategy='mean'), None, False),
+        'linear': (lambda: LinearRegression(), None, False),
+        'ridge': (lambda: Ridge(alpha=1.0), None, False),
+        'random_forest': (lambda: RandomForestRegressor(n_estimators=100, random_state=42), None, False),
+        'random_forest_k30': (lambda: RandomForestRegressor(n_estimators=100, random_state=42), 30, False),
+        'gradient_boosting_k30': (lambda: HistGradientBoostingRegressor(random_state=42), 30, True),
+    }
+
+def load_matrix(data_file, titles=JOB_TITLES):
+    """The skill matrix the analysis uses (numeric skills removed), salaries and titles of `data_file`."""
+    from compactdata import load_compact
+
+    dataset = load_compact(data_file, titles=titles)
+    skills = dataset.vocab.skills
+    columns = [i for i, skill in enumerate(skills) if not re.match(r'^\d+$', skill)]
+    X = dataset.to_csr()[:, columns].tocsr()
+    return X, dataset.salary.astype('float64'), np.asarray(dataset.title).astype(str), [skills[i] for i in columns]
+
+class EvaluationCache:
+    """
+    Evaluation artifacts for one dataset, stored under EVAL_DIR/<data key>/: the fold of every row,
+    the SelectKBest (f_regression) scores of each fold's training rows and each (model, fold) result.
+    The data key hashes the data file, skill rules, aliases, fold count and seed, so any change starts afresh.
+    """
+    def __init__(self, data_key, directory=EVAL_DIR):
+        self.directory = os.path.join(directory, data_key)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def folds(self, titles, n_splits, seed):
+        """Fold number of every row, from a StratifiedKFold over job titles (computed once)."""
+        path = self.path("folds.npy")
+        if os.path.exists(path):
+            return np.load(path)
+        from sklearn.model_selection import StratifiedKFold
+        folds = np.empty(len(titles), dtype=np.int8)
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+        for fold, (_, test) in enumerate(splitter.split(np.zeros(len(titles)), titles)):
+            folds[test] = fold
+        np.save(path, folds)
+        return folds
+
+    def feature_scores(self, X, y, train, fold):
+        """SelectKBest f_regression scores of the fold's training rows (computed once, shared by every k)."""
+        path = self.path(f"scores-fold{fold}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+        from sklearn.feature_selection import f_regression
+        scores, _ = f_regression(X[train], y[train])
+        scores = np.nan_to_num(scores)  # Constant columns in this fold score NaN
+        np.save(path, scores)
+        return scores
+
+    def result_path(self, model_name, spec_hash, fold):
+        return self.path(f"result-{model_name}-{spec_hash}-fold{fold}.json")
+
+    def load_result(self, model_name, spec_hash, fold):
+        path = self.result_path(model_name, spec_hash, fold)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def save_result(self, model_name, spec_hash, fold, result):
+        path = self.result_path(model_name, spec_hash, fold)
+        with open(path + ".tmp", 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+        os.replace(path + ".tmp", path)
+
+def spec_hash(estimator, k):
+    """Hash of a model's hyperparameters and k, so editing a family invalidates only its own results."""
+    spec = {"estimator": type(estimator).__name__, "params": estimator.get_params(), "k": k}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+
+def evaluate_fold(model_name, X, y, titles, folds, fold, scores, n_jobs=1):
+    """Fit one model family on every fold but `fold`, then score it on `fold`: R² (overall and per title), MAE and latency."""
+    from sklearn.metrics import r2_score, mean_absolute_error
+
+    make_model, k, dense = model_families()[model_name]  # Looked up by name so process workers can rebuild it
+
+    train, test = np.flatnonzero(folds != fold), np.flatnonzero(folds == fold)
+    columns = np.sort(np.argsort(scores)[::-1][:k]) if k else slice(None)
+    X_train, X_test = X[train][:, columns], X[test][:, columns]
+    if dense:
+        X_train, X_test = X_train.toarray(), X_test.toarray()
+
+    model = make_model()
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+    start = time.perf_counter()
+    model.fit(X_train, y[train])
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    predicted = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    test_titles = titles[test]
+    return {
+        "model": model_name,
+        "fold": fold,
+        "train_rows": len(train),
+        "test_rows": len(test),
+        "r2": float(r2_score(y[test], predicted)),
+        "mae": float(mean_absolute_error(y[test], predicted)),
+        "r2_by_title": {title: float(r2_score(y[test][test_titles == title], predicted[test_titles == title]))
+                        for title in np.unique(test_titles) if (test_titles == title).sum() > 1},
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+    }
+
+def evaluate(data_file, model_names=None, n_splits=5, seed=42, use_processes=False, cores=None,
+             directory=EVAL_DIR):
+    """
+    Cross-validate the model families with a stratified k-fold by title, running the (model, fold) tasks
+    concurrently. Folds, feature scores and finished results are reused from the cache, so adding a
+    model only fits that model. Returns the list of per-fold results.
+    """
+    families = model_families()
+    model_names = model_names or list(families)
+    data_key = model_key(data_file, {"titles": JOB_TITLES, "folds": n_splits, "seed": seed},
+                         config_files=[RULES_FILE, ALIASES_FILE])
+    cache = EvaluationCache(data_key, directory)
+
+    X, y, titles, _ = load_matrix(data_file)
+    folds = cache.folds(titles, n_splits, seed)
+    scores = [cache.feature_scores(X, y, folds != fold, fold) for fold in range(n_splits)]
+
+    results = []
+    pending = []
+    for name in model_names:
+        make_model, k, _ = families[name]
+        model_hash = spec_hash(make_model(), k)
+        for fold in range(n_splits):
+            cached = cache.load_result(name, model_hash, fold)
+            if cached is not None:
+                results.append(cached)
+            else:
+                pending.append((name, model_hash, fold))
+    print(f"Data {data_key}: {len(y)} rows, {X.shape[1]} skills, {n_splits} folds; "
+          f"{len(results)} results cached, {len(pending)} to compute")
+
+    if pending:
+        workers, n_jobs = split_cores(len(pending), cores)
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        start = time.perf_counter()
+        with executor_class(max_workers=workers) as executor:
+            futures = {
+                (name, model_hash, fold): executor.submit(evaluate_fold, name, X, y, titles, folds, fold,
+                                                          scores[fold], n_jobs)
+                for name, model_hash, fold in pending
+            }
+            for (name, model_hash, fold), future in futures.items():
+                result = future.result()
+                cache.save_result(name, model_hash, fold, result)
+                results.append(result)
+        print(f"✅ Computed {len(pending)} fold results in {time.perf_counter() - start:.2f}s "
+              f"({workers} workers x {n_jobs} jobs)")
+    return results
+
+def summarize(results):
+    """One row per model: mean R² (and its spread over folds), R² per title, MAE, fit time and predict latency."""
+    df = pd.DataFrame(results)
+    by_title = pd.DataFrame([r["r2_by_title"] for r in results], index=df.index).add_prefix("r2 ")
+    df = pd.concat([df, by_title], axis=1)
+    df["predict_us_per_row"] = df["predict_seconds"] / df["test_rows"] * 1e6
+    summary = df.groupby("model").agg(
+        r2=("r2", "mean"), r2_std=("r2", "std"), mae=("mae", "mean"),
+        fit_seconds=("fit_seconds", "mean"), predict_us_per_row=("predict_us_per_row", "mean"),
+        **{column: (column, "mean") for column in by_title.columns},
+    )
+    return summary.sort_values("r2", ascending=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validate salary models by title and compare R² with latency.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="Filtered job data: .csv, .parquet or .arrow")
+    parser.add_argument("--models", nargs="+", default=None, choices=list(model_families()),
+                        help="Model families to evaluate (default: all)")
+    parser.add_argument("--folds", type=int, default=5, help="Number of stratified folds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processes", action="store_true", help="Run the fold tasks in processes instead of threads")
+    parser.add_argument("--cores", type=int, default=None, help="Cores to use (default: all)")
+    parser.add_argument("--output", default=None, help="Also save the comparison table as CSV")
+    args = parser.parse_args()
+
+    results = evaluate(args.file, args.models, args.folds, args.seed, args.processes, args.cores)
+    summary = summarize(results)
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:,.3f}'.format):
+        print(summary)
+    if args.output:
+        summary.to_csv(args.output)
+        print(f"✅ Report saved to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+import time
+import argparse
+import numpy as np
+from scipy import sparse
+
+# Skill -> integer ID mapping kept between runs so feature columns stay stable
+VOCAB_FILE = "skill_vocab.json"
+
+class SkillVocabulary:
+    """
+    Interned skill vocabulary: every skill gets a stable integer ID (its column in the skill matrix).
+    New skills are appended, so IDs saved by earlier runs never change.
+    """
+    def __init__(self, skills=()):
+        self.skills = []
+        self.ids = {}
+        for skill in skills:
+            self.add(skill)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def add(self, skill):
+        """Returns the ID of `skill`, assigning the next free ID if it is new."""
+        skill_id = self.ids.get(skill)
+        if skill_id is None:
+            skill_id = self.ids[skill] = len(self.skills)
+            self.skills.append(skill)
+        return skill_id
+
+    @classmethod
+    def load(cls, path=VOCAB_FILE):
+        """Load a saved vocabulary, or start an empty one if `path` does not exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as file:
+            return cls(json.load(file))
+
+    def save(self, path=VOCAB_FILE):
+        """Save the skills in ID order."""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.skills, file, indent=0)
+
+def build_skill_matrix(skill_lists, vocab, grow=True):
+    """
+    Build a CSR matrix with one row per skill list and a 1 in the column of each skill.
+    Skills missing from `vocab` are added if `grow`, otherwise ignored.
+    Time and memory are linear in the number of (row, skill) pairs.
+    """
+    indptr = [0]
+    indices = []
+    lookup = vocab.add if grow else vocab.ids.get
+    for skills in skill_lists:
+        row = {lookup(skill) for skill in skills}
+        row.discard(None)
+        indices.extend(sorted(row))
+        indptr.append(len(indices))
+
+    indices = np.asarray(indices, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.float32)  # RandomForest works on float32, so no copy when fitting
+    return sparse.csr_matrix((data, indices, np.asarray(indptr, dtype=np.int64)),
+                             shape=(len(indptr) - 1, len(vocab)))
+
+def encode_skills(skills, vocab):
+    """Encode a single skill list as a one-row matrix, ignoring skills the vocabulary doesn't know."""
+    return build_skill_matrix([skills], vocab, grow=False)
+
+def rows_by_value(values):
+    """Returns {value: array of row positions}, e.g. the rows of each job title."""
+    values = np.asarray(values, dtype=object)
+    return {value: np.flatnonzero(values == value) for value in dict.fromkeys(values)}
+
+def matrix_nbytes(matrix):
+    """Bytes held by a CSR matrix's data, indices and indptr arrays."""
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sparse skill matrix and report its size.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="CSV file with a Skills column")
+    parser.add_argument("--vocab", default=VOCAB_FILE, help="Skill vocabulary file")
+    args = parser.parse_args()
+
+    with open(args.file, mode='r', newline='', encoding='utf-8') as file:
+        skill_lists = [[skill.strip() for skill in row['Skills'].split(';') if skill.strip()]
+                       for row in csv.DictReader(file)]
+
+    vocab = SkillVocabulary.load(args.vocab)
+    start = time.perf_counter()
+    matrix = build_skill_matrix(skill_lists, vocab)
+    elapsed = time.perf_counter() - start
+    vocab.save(args.vocab)
+
+    dense_bytes = matrix.shape[0] * matrix.shape[1] * np.dtype(np.int64).itemsize
+    print(f"Built {matrix.shape[0]} x {matrix.shape[1]} skill matrix ({matrix.nnz} skills set) in {elapsed:.3f}s")
+    print(f"Sparse: {matrix_nbytes(matrix) / 1e6:.2f} MB, dense int64 frame: {dense_bytes / 1e6:.2f} MB")
+
+if __name__ == "__main__":
+    main()
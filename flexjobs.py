@@ -1,27 +1,46 @@
 import csv
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import argparse
+from functools import partial
 from selenium.webdriver.common.by import By
 import time
+from throttle import RateController, wait_for_element
+from sessionpool import SessionPool, PROFILES, create_chrome_driver
+import metrics
+
+# CSS selector of a job card on the search results page
+JOB_CARD_SELECTOR = 'div.sc-jv5lm6-0.jqvXcB'
+
+# Name of this scraper in the run metrics
+SCRAPER = "flexjobs"
+
+# Shared request budget for all searches
+controller = RateController(rate=0.5, max_rate=0.5, name=SCRAPER)
 
 # List to store all job data
 all_job_data = []
 
-# Function to initialize and restart WebDriver
-def initialize_driver():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    return driver
+# Function to initialize WebDriver
+def initialize_driver(profile="full"):
+    return create_chrome_driver(profile)
 
 # Function to scrape job data from a given URL
 def scrape_jobs(url, job_title, driver):
-    driver.get(url)
+    controller.acquire()
+    start = time.monotonic()
+    ready = False  # A page load that raises is recorded as a failed request, so the controller backs off
+    try:
+        with metrics.timer('page_load_seconds', scraper=SCRAPER):
+            driver.get(url)
 
-    # Allow the page to load
-    time.sleep(5)  # Adjust the sleep time based on how long the page takes to load
+            # Wait until the job cards are rendered instead of sleeping a fixed time
+            ready = wait_for_element(driver, JOB_CARD_SELECTOR)
+    finally:
+        controller.record(time.monotonic() - start, ok=ready)
 
     # Find all job elements (update the CSS selectors as per the HTML structure)
-    jobs = driver.find_elements(By.CSS_SELECTOR, 'div.sc-jv5lm6-0.jqvXcB')
+    jobs = driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+    metrics.selector(SCRAPER, "job_cards", bool(jobs))
+    metrics.rows(SCRAPER, len(jobs))
 
     # Loop through each job element and scrape the data
     for job in jobs:
@@ -31,28 +50,36 @@ def scrape_jobs(url, job_title, driver):
             # Extract the job name, handling cases where the element might not exist
             job_name_tag = job.find_element(By.CSS_SELECTOR, 'a.fQyPIb.textWrap')
             job_info['Job Name'] = job_name_tag.text.strip() if job_name_tag else 'N/A'
+            metrics.selector(SCRAPER, 'Job Name', job_info['Job Name'] != 'N/A')
         except:
+            metrics.selector(SCRAPER, 'Job Name', False)
             job_info['Job Name'] = 'N/A'
         
         try:
             # Extract the job description
             job_description_tag = job.find_element(By.CSS_SELECTOR, 'p.dAsgtY')
             job_info['Description'] = job_description_tag.text.strip() if job_description_tag else 'N/A'
+            metrics.selector(SCRAPER, 'Description', job_info['Description'] != 'N/A')
         except:
+            metrics.selector(SCRAPER, 'Description', False)
             job_info['Description'] = 'N/A'
         
         try:
             # Extract the remote option (if present)
             remote_option_tag = job.find_element(By.CSS_SELECTOR, 'li[id^="remoteoption"]')
             job_info['Remote Option'] = remote_option_tag.text.strip() if remote_option_tag else 'N/A'
+            metrics.selector(SCRAPER, 'Remote Option', job_info['Remote Option'] != 'N/A')
         except:
+            metrics.selector(SCRAPER, 'Remote Option', False)
             job_info['Remote Option'] = 'N/A'
         
         try:
             # Extract the salary range (if present)
             salary_range_tag = job.find_element(By.CSS_SELECTOR, 'li[id^="salartRange"]')
             job_info['Salary Range'] = salary_range_tag.text.strip() if salary_range_tag else 'N/A'
+            metrics.selector(SCRAPER, 'Salary Range', job_info['Salary Range'] != 'N/A')
         except:
+            metrics.selector(SCRAPER, 'Salary Range', False)
             job_info['Salary Range'] = 'N/A'
         
         # Append the job data to the all_job_data list
@@ -65,35 +92,48 @@ urls = [
     "https://www.flexjobs.com/search?searchkeyword=Machine%20Learning%20Engineer&useclocation=true"
 ]
 
-# Scrape Data Scientist jobs
-driver = initialize_driver()  # Restart WebDriver
-scrape_jobs(urls[0], 'Data Scientist', driver)
+# Job titles for each search URL
+job_titles = ['Data Scientist', 'Software Engineer', 'Machine Learning Engineer']
 
-# Scrape Software Engineer jobs
-driver.quit()  # Close current driver
-driver = initialize_driver()  # Restart WebDriver
-scrape_jobs(urls[1], 'Software Engineer', driver)
+def main(profile="full"):
+    # One warm browser session is reused for all searches instead of relaunching Chrome per URL
+    pool = SessionPool(partial(initialize_driver, profile), size=1)
+    try:
+        for url, job_title in zip(urls, job_titles):
+            with pool.session() as driver:
+                scrape_jobs(url, job_title, driver)
+                pool.record_page_weight(driver)
+    finally:
+        pool.close()
 
-# Scrape Machine Learning Engineer jobs
-driver.quit()  # Close current driver
-driver = initialize_driver()  # Restart WebDriver
-scrape_jobs(urls[2], 'Machine Learning Engineer', driver)
-
-# Write the collected job data to a single CSV file
-filename = 'flexjobs_jobs.csv'
-with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-    fieldnames = ['Job Title', 'Job Name', 'Description', 'Remote Option', 'Salary Range']
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-    
-    # Write the header
-    writer.writeheader()
-    
-    # Write the job data rows
-    for job in all_job_data:
-        writer.writerow(job)
+    # Write the collected job data to a single CSV file
+    filename = 'flexjobs_jobs.csv'
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        fieldnames = ['Job Title', 'Job Name', 'Description', 'Remote Option', 'Salary Range']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        
+        # Write the header
+        writer.writeheader()
+        
+        # Write the job data rows
+        for job in all_job_data:
+            writer.writerow(job)
 
-# Print a confirmation message
-print(f"Job data for Data Scientist, Machine Learning Engineer, and Software Engineer has been saved to '{filename}'.")
+    # Print a confirmation message
+    print(f"Job data for Data Scientist, Machine Learning Engineer, and Software Engineer has been saved to '{filename}'.")
+    controller.print_report("FlexJobs scraping")
+    pool.print_metrics()
 
-# Close the driver
-driver.quit()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape FlexJobs search results.")
+    parser.add_argument("--profile", choices=PROFILES, default="full",
+                        help="Browser profile; 'lean' is headless and blocks images, fonts, CSS and trackers")
+    parser.add_argument("--metrics", default=None,
+                        help="Write run metrics to this file (.prom for Prometheus text, otherwise JSON lines)")
+    args = parser.parse_args()
+    try:
+        with metrics.stage(SCRAPER):
+            main(profile=args.profile)
+    finally:
+        if args.metrics:
+            metrics.export(args.metrics)
@@ -0,0 +1,183 @@
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.linear_model import SGDRegressor
+import columnar
+from features import rows_by_value
+from modelregistry import ModelRegistry, model_key
+from skillaliases import get_canonicalizer, ALIASES_FILE
+from skillfilter import get_skill_filter, RULES_FILE
+
+# Width of the hashed skill feature space; fixed, so new skills never change the model's columns
+N_FEATURES = 2 ** 18
+
+# SGDRegressor settings for the per-title models
+SGD_PARAMS = {
+    'loss': 'squared_error',
+    'penalty': 'l2',
+    'alpha': 1e-5,
+    'learning_rate': 'invscaling',
+    'eta0': 0.1,
+    'power_t': 0.25,
+    'random_state': 42,
+}
+
+# Salaries are divided by this for fitting (so SGD steps stay well scaled) and multiplied back on prediction
+SALARY_SCALE = 100_000.0
+
+# Registry name of the incremental artifacts (the RandomForest artifacts are named "model")
+MODEL_NAME = "incremental"
+
+COLUMNS = ['Title', 'Location', 'Skills', 'Salary']
+
+def make_hasher(n_features=N_FEATURES):
+    """Skill lists -> fixed-width sparse rows; stateless, so every chunk and every day maps skills the same way."""
+    return FeatureHasher(n_features=n_features, input_type='string', alternate_sign=False)
+
+def prepare_chunk(chunk, titles=None):
+    """
+    Clean one chunk the way load_compact cleans the whole file: rows with a missing column are dropped,
+    titles stripped (and limited to `titles`), skills filtered and canonicalized.
+    Returns (titles array, skill lists, salaries array).
+    """
+    skill_filter = get_skill_filter()
+    canonicalizer = get_canonicalizer()
+
+    title = chunk['Title'].fillna('').astype(str).str.strip()
+    salary = pd.to_numeric(chunk['Salary'], errors='coerce')
+    raw_skills = chunk['Skills'].map(columnar.split_list)
+    location = chunk['Location'].fillna('').astype(str).str.strip()
+    keep = salary.notna() & raw_skills.notna() & (title != '') & (location != '')
+    if titles is not None:
+        keep &= title.isin(titles)
+
+    skills = [canonicalizer.canonicalize(skill_filter.filter_experience(value)) for value in raw_skills[keep]]
+    return title[keep].to_numpy(), skills, salary[keep].to_numpy(dtype=np.float64)
+
+def new_artifact(n_features=N_FEATURES, params=SGD_PARAMS):
+    return {
+        'kind': MODEL_NAME,
+        'models': {},  # Title -> SGDRegressor
+        'offsets': {},  # Title -> mean scaled salary of its first chunk; the model learns the deviation from it
+        'rows': {},  # Title -> rows learned so far, over every run
+        'n_features': n_features,
+        'params': dict(params),
+        'salary_scale': SALARY_SCALE,
+        'parent': None,  # Key of the artifact this one was warm-started from
+    }
+
+def train_chunks(artifact, chunks, titles=None):
+    """
+    Update the per-title models of `artifact` with partial_fit, one chunk at a time.
+    Each chunk is scored before the models learn from it (progressive validation), so the returned
+    {title: mean absolute error} measures rows the model had not seen yet. Returns (rows, errors).
+    """
+    hasher = make_hasher(artifact['n_features'])
+    scale = artifact['salary_scale']
+    error_sums = {}
+    scored = {}
+    rows = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        chunk_titles, skills, salary = prepare_chunk(chunk, titles)
+        if not len(chunk_titles):
+            continue
+        X = hasher.transform(skills)
+        y = salary / scale
+        for job, job_rows in rows_by_value(chunk_titles).items():
+            model = artifact['models'].get(job)
+            if model is None:
+                model = artifact['models'][job] = SGDRegressor(**artifact['params'])
+                artifact['offsets'][job] = float(y[job_rows].mean())
+            else:
+                predicted = model.predict(X[job_rows]) + artifact['offsets'][job]
+                error_sums[job] = error_sums.get(job, 0.0) + np.abs(predicted - y[job_rows]).sum()
+                scored[job] = scored.get(job, 0) + len(job_rows)
+            model.partial_fit(X[job_rows], y[job_rows] - artifact['offsets'][job])
+            artifact['rows'][job] = artifact['rows'].get(job, 0) + len(job_rows)
+        rows += len(chunk_titles)
+        print(f"{rows} rows learned ({rows / (time.perf_counter() - start):,.0f} rows/s)", file=sys.stderr)
+    return rows, {job: error_sums[job] / scored[job] * scale for job in scored}
+
+def predict(artifact, titles, skill_lists):
+    """Predicted salaries for (title, skills) rows; NaN for titles the artifact has no model for."""
+    X = make_hasher(artifact['n_features']).transform(skill_lists)
+    predictions = np.full(len(titles), np.nan)
+    for job, rows in rows_by_value(np.asarray(titles)).items():
+        model = artifact['models'].get(job)
+        if model is not None:
+            predictions[rows] = (model.predict(X[rows]) + artifact['offsets'][job]) * artifact['salary_scale']
+    return predictions
+
+def peak_memory_mb():
+    """Peak resident memory of this process, or None where the resource module is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3  # Bytes on macOS, kilobytes on Linux
+
+def train(data_file, warm_start=None, registry=None, titles=None, chunk_size=50_000, epochs=1):
+    """
+    Stream `data_file` through the per-title models `epochs` times and save the result in the registry.
+    With `warm_start` (an artifact), training continues from it, so only new rows need to be passed.
+    """
+    if epochs < 1:
+        raise ValueError(f"epochs must be at least 1, got {epochs}")
+    registry = registry or ModelRegistry()
+    artifact = warm_start if warm_start is not None else new_artifact()
+    parent = artifact.get('key')
+    if parent:
+        print(f"Warm start from {MODEL_NAME} {parent} ({sum(artifact['rows'].values())} rows learned so far)")
+
+    start = time.perf_counter()
+    for epoch in range(epochs):
+        rows, errors = train_chunks(artifact, columnar.read_table_chunks(data_file, COLUMNS, chunk_size), titles)
+        # Only the first pass scores rows the model has not seen; later passes report training error
+        label = "on rows not yet learned" if epoch == 0 else "training error"
+        for job, error in sorted(errors.items()):
+            print(f"Epoch {epoch + 1}, {job}: mean absolute error ${error:,.0f} {label}")
+
+    params = {**artifact['params'], 'n_features': artifact['n_features'], 'epochs': epochs, 'parent': parent}
+    artifact['key'] = model_key(data_file, params, config_files=[RULES_FILE, ALIASES_FILE])
+    artifact['parent'] = parent
+    artifact['trained_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    path = registry.save(artifact['key'], artifact, MODEL_NAME)
+
+    peak = peak_memory_mb()
+    print(f"✅ Learned {rows} rows per epoch in {time.perf_counter() - start:.2f}s, saved to {path}"
+          + (f" (peak memory {peak:.0f} MB)" if peak else ""))
+    return artifact
+
+def main():
+    parser = argparse.ArgumentParser(description="Train per-title salary models out of core, chunk by chunk.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="Filtered job data: .csv, .parquet or .arrow")
+    parser.add_argument("--titles", nargs="+", default=['Software Engineering', 'Data Scientist', 'AI/ML'],
+                        help="Job titles to train models for")
+    parser.add_argument("--all-titles", action="store_true", help="Train a model for every title in the data")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows held in memory at a time")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the data")
+    parser.add_argument("--warm-start", nargs="?", const="latest", default=None,
+                        help="Continue from a saved artifact (default: the latest one) using only the new rows in FILE")
+    parser.add_argument("--model-dir", default=None, help="Model registry directory")
+    args = parser.parse_args()
+    if args.epochs < 1:
+        parser.error("--epochs must be at least 1")
+
+    registry = ModelRegistry(args.model_dir) if args.model_dir else ModelRegistry()
+    warm_start = None
+    if args.warm_start:
+        import joblib
+        warm_start = registry.latest(MODEL_NAME) if args.warm_start == "latest" else joblib.load(args.warm_start)
+        if warm_start is None:
+            parser.error(f"No {MODEL_NAME} model in '{registry.directory}' to warm-start from")
+
+    train(args.file, warm_start, registry, titles=None if args.all_titles else args.titles,
+          chunk_size=args.chunk_size, epochs=args.epochs)
+
+if __name__ == "__main__":
+    main()
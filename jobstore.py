@@ -0,0 +1,89 @@
+import csv
+import sqlite3
+import time
+import columnar
+
+# Columns of processed_job_data.csv, in order
+FIELDNAMES = ["Job Name", "Location", "Salary", "Qualifications"]
+
+STORE_FILE = "job_store.db"
+
+def open_job_store(db_path=STORE_FILE):
+    """
+    Open (or create) the SQLite job store keyed by job URL.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the scraper while it commits
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            url TEXT PRIMARY KEY,
+            job_name TEXT,
+            location TEXT,
+            salary TEXT,
+            qualifications TEXT,
+            fetched_at REAL
+        )
+    """)
+    conn.commit()
+    return conn
+
+def get_fetched_urls(conn, retry_missing=False):
+    """
+    Returns the set of job URLs already in the store.
+    With `retry_missing`, URLs whose page yielded no data at all are left out so they get fetched again.
+    """
+    query = "SELECT url FROM jobs"
+    if retry_missing:
+        query += " WHERE NOT (location = 'N/A' AND salary = 'N/A' AND qualifications = 'N/A')"
+    return {row[0] for row in conn.execute(query)}
+
+def save_jobs(conn, jobs):
+    """
+    Insert or update a batch of (job_url, job_data) pairs in a single transaction.
+    """
+    now = time.time()
+    rows = [
+        (url, job["Job Name"], job["Location"], job["Salary"], job["Qualifications"], now)
+        for url, job in jobs
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO jobs (url, job_name, location, salary, qualifications, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+def count_jobs(conn):
+    """
+    Returns the number of jobs in the store.
+    """
+    return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+def export_jobs_to_csv(conn, output_file):
+    """
+    Export every job in the store to a CSV file with the processed_job_data.csv schema.
+    """
+    count = 0
+    with open(output_file, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDNAMES)
+        for row in conn.execute("SELECT job_name, location, salary, qualifications FROM jobs ORDER BY rowid"):
+            writer.writerow(row)
+            count += 1
+    print(f"✅ Exported {count} job entries to '{output_file}'.")
+    return count
+
+def export_jobs(conn, output_file):
+    """
+    Export every job in the store to CSV, or to Parquet/Arrow if `output_file` has a columnar extension.
+    """
+    if not columnar.is_columnar(output_file):
+        return export_jobs_to_csv(conn, output_file)
+
+    import pandas as pd
+    rows = conn.execute("SELECT job_name, location, salary, qualifications FROM jobs ORDER BY rowid").fetchall()
+    df = pd.DataFrame(rows, columns=FIELDNAMES)
+    columnar.write_table(df, output_file, list_columns=(), category_columns=('Location',), float_columns=())
+    print(f"✅ Exported {len(df)} job entries to '{output_file}'.")
+    return len(df)
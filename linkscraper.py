@@ -1,23 +1,28 @@
 import time
 import csv
-import undetected_chromedriver as uc
+import argparse
+from functools import partial
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from throttle import RateController, wait_for_element
+from sessionpool import SessionPool, PROFILES, create_uc_driver
+import metrics
+from dedup import canonical_url
 
-def initialize_driver():
+# CSS selector of the job posting links on a search results page
+JOB_LINK_SELECTOR = ".chakra-button.css-1djbb1k"
+
+# Name of this scraper in the run metrics
+SCRAPER = "linkscraper"
+
+def initialize_driver(profile="full"):
     """
     Initialize undetected Chrome WebDriver.
     """
-    options = uc.ChromeOptions()
-    options.headless = False  # Set True if you want headless mode
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-
-    driver = uc.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    return driver
+    return create_uc_driver(profile)
 
 def extract_job_links_from_page(driver):
     """
@@ -26,13 +31,15 @@ def extract_job_links_from_page(driver):
     job_links = set()  # Using set to avoid duplicates
 
     # Find all job posting elements with class that might hold job links
-    job_elements = driver.find_elements(By.CSS_SELECTOR, ".chakra-button.css-1djbb1k")
+    job_elements = driver.find_elements(By.CSS_SELECTOR, JOB_LINK_SELECTOR)
+    metrics.selector(SCRAPER, "job_links", bool(job_elements))
     
     for job in job_elements:
         link = job.get_attribute("href")
         if link:
-            job_links.add(link)  # Adding link to set ensures no duplicates
+            job_links.add(canonical_url(link))  # Canonical URLs, so tracking parameters don't hide duplicates
 
+    metrics.rows(SCRAPER, len(job_links))
     return job_links
 
 def get_next_page_url(driver):
@@ -42,23 +49,51 @@ def get_next_page_url(driver):
     """
     try:
         next_link = driver.find_element(By.CSS_SELECTOR, 'a[aria-label="Next page"]')
+        metrics.selector(SCRAPER, "next_page", True)
         return next_link.get_attribute("href")
     except NoSuchElementException:
+        metrics.selector(SCRAPER, "next_page", False)
         return None
 
-def scrape_all_pages(driver, start_url, max_pages=100):
+def load_results_page(driver, url, controller, pool=None):
+    """
+    Loads a search results page under the rate controller's budget and waits for the job links to render.
+    A page where the links never appear counts as an error so the controller backs off.
+    If a session pool is given, the page weight is added to its transfer totals.
+    """
+    controller.acquire()
+    start = time.monotonic()
+    try:
+        with metrics.timer('page_load_seconds', scraper=SCRAPER):
+            driver.get(url)
+            ready = wait_for_element(driver, JOB_LINK_SELECTOR)
+    except Exception:
+        controller.record(time.monotonic() - start, ok=False)
+        raise
+    controller.record(time.monotonic() - start, ok=ready)
+    if pool:
+        pool.record_page_weight(driver)
+    return ready
+
+def scrape_all_pages(driver, start_url, max_pages=100, controller=None, pool=None):
     """
     Scrapes up to `max_pages` pages for job links.
+    Without a `driver`, every page is loaded in its own lease from `pool`, so the pool's
+    recycle limit counts pages even on a long pagination walk.
     """
+    controller = controller or RateController(rate=0.5, max_rate=0.5, name=SCRAPER)
     all_links = set()  # Using set to store unique job links
-    driver.get(start_url)
-    time.sleep(5)
+    page_url = start_url
 
     page_count = 0
 
     while page_count < max_pages:
-        # Extract job links on current page
-        page_links = extract_job_links_from_page(driver)
+        with (pool.session() if driver is None else nullcontext(driver)) as page_driver:
+            load_results_page(page_driver, page_url, controller, pool)
+            # Extract job links on current page
+            page_links = extract_job_links_from_page(page_driver)
+            # Attempt to find the next page link
+            next_page_url = get_next_page_url(page_driver) if page_links else None
         if not page_links:
             print("No job links found on this page. Stopping pagination.")
             break
@@ -67,20 +102,164 @@ def scrape_all_pages(driver, start_url, max_pages=100):
         page_count += 1
         print(f"Extracted {len(page_links)} links on this page. Total so far: {len(all_links)}")
 
-        # Attempt to find the next page link
-        next_page_url = get_next_page_url(driver)
         if not next_page_url:
             print("No 'Next page' link found. Pagination ended.")
             break
 
         # Navigate to next page
-        print(f"Navigating to: {next_page_url}")
-        driver.get(next_page_url)
-        time.sleep(3)
+        if page_count < max_pages:
+            print(f"Navigating to: {next_page_url}")
+        page_url = next_page_url
 
     print(f"Stopped after {page_count} pages.")
     return list(all_links)  # Convert set back to list for saving to CSV
 
+def learn_page_pattern(current_url, next_url):
+    """
+    Learns how page numbers are encoded by comparing the first results page URL with its "Next page" URL.
+    Returns a pattern usable by build_page_url, or None if the next page can't be predicted
+    (e.g. only an opaque cursor changes between the two pages).
+    """
+    current_params = dict(parse_qsl(urlparse(current_url).query, keep_blank_values=True))
+    next_parts = urlparse(next_url)
+    next_params = parse_qsl(next_parts.query, keep_blank_values=True)
+
+    page_param = None
+    first_value = step = 0
+    opaque_params = set()
+    for name, value in next_params:
+        if current_params.get(name) == value:
+            continue
+        if value.isdigit() and page_param is None:
+            page_param = name
+            if name in current_params and current_params[name].isdigit():
+                # Both pages carry the parameter: value(k) = first + (k - 1) * step
+                first_value = int(current_params[name])
+                step = int(value) - first_value
+            elif int(value) == 2:
+                # Page number: value(k) = k
+                first_value, step = 1, 1
+            else:
+                # Result offset missing on the first page: value(k) = (k - 1) * step
+                first_value, step = 0, int(value)
+        else:
+            # Cursors and other tokens that change from page to page can't be predicted, so drop them
+            opaque_params.add(name)
+
+    if page_param is None or step <= 0:
+        return None
+
+    base_params = [(name, value) for name, value in next_params if name not in opaque_params]
+    return {
+        "parts": next_parts,
+        "params": base_params,
+        "page_param": page_param,
+        "first_value": first_value,
+        "step": step,
+    }
+
+def build_page_url(pattern, page_number):
+    """
+    Builds the URL of results page `page_number` (1-based) from a learned pattern.
+    """
+    value = str(pattern["first_value"] + (page_number - 1) * pattern["step"])
+    params = [(name, value if name == pattern["page_param"] else v) for name, v in pattern["params"]]
+    return urlunparse(pattern["parts"]._replace(query=urlencode(params)))
+
+def scrape_pages_in_parallel(search_urls, num_workers=4, max_pages=100, wave_size=None,
+                             controller=None, driver_factory=None, pool=None):
+    """
+    Scrapes the result pages of every search URL concurrently.
+    The first page of each search is loaded to learn its pagination pattern, then the following
+    pages are predicted and fetched in waves of `wave_size` pages per search until a page
+    comes back without new links. Searches whose next page can't be predicted are walked
+    sequentially on one of the workers.
+    Workers lease browser sessions from `pool` (a new warm pool of `num_workers` sessions if not given).
+    Returns a dict mapping each search key to its list of links.
+    """
+    controller = controller or RateController(rate=2.0, max_rate=2.0, name=SCRAPER)
+    wave_size = wave_size or num_workers * 2
+    own_pool = pool is None
+    if own_pool:
+        pool = SessionPool(driver_factory or initialize_driver, size=num_workers)
+        pool.warm_up()
+
+    def load_page(url, want_next_url=False):
+        with pool.session() as driver:
+            load_results_page(driver, url, controller, pool)
+            links = extract_job_links_from_page(driver)
+            next_url = get_next_page_url(driver) if want_next_url else None
+        return links, next_url
+
+    def walk_sequentially(url):
+        return scrape_all_pages(None, url, max_pages=max_pages, controller=controller, pool=pool)
+
+    all_links = {key: set() for key in search_urls}
+    patterns = {}
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            # First wave: page 1 of every search, used to learn the pagination pattern
+            first_pages = {key: executor.submit(load_page, url, True) for key, url in search_urls.items()}
+            sequential = {}
+            for key, future in first_pages.items():
+                try:
+                    links, next_url = future.result()
+                except Exception as e:
+                    print(f"Error loading first page for {key}: {e}")
+                    continue
+                all_links[key].update(links)
+                print(f"[{key}] Extracted {len(links)} links on page 1.")
+                if not links or not next_url or max_pages <= 1:
+                    continue
+                pattern = learn_page_pattern(search_urls[key], next_url)
+                if pattern:
+                    patterns[key] = pattern
+                else:
+                    print(f"[{key}] Could not predict the page URLs, walking pages sequentially.")
+                    sequential[key] = executor.submit(walk_sequentially, search_urls[key])
+
+            # Following waves: predicted pages of all searches at once
+            next_page = {key: 2 for key in patterns}
+            while next_page:
+                futures = {}
+                for key, start in next_page.items():
+                    for page_number in range(start, min(start + wave_size, max_pages + 1)):
+                        url = build_page_url(patterns[key], page_number)
+                        futures[(key, page_number)] = executor.submit(load_page, url)
+
+                for key, start in list(next_page.items()):
+                    last_page = min(start + wave_size, max_pages + 1) - 1
+                    finished = last_page >= max_pages
+                    for page_number in range(start, last_page + 1):
+                        try:
+                            links, _ = futures[(key, page_number)].result()
+                        except Exception as e:
+                            print(f"[{key}] Error loading page {page_number}: {e}")
+                            continue
+                        new_links = links - all_links[key]
+                        if not new_links:
+                            print(f"[{key}] Page {page_number} had no new links. Pagination ended.")
+                            finished = True
+                            break
+                        all_links[key].update(new_links)
+                        print(f"[{key}] Extracted {len(links)} links on page {page_number}. Total so far: {len(all_links[key])}")
+
+                    if finished:
+                        del next_page[key]
+                    else:
+                        next_page[key] = last_page + 1
+
+            for key, future in sequential.items():
+                try:
+                    all_links[key].update(future.result())
+                except Exception as e:
+                    print(f"[{key}] Error while walking pages: {e}")
+    finally:
+        if own_pool:
+            pool.close()
+
+    return {key: list(links) for key, links in all_links.items()}
+
 def save_links_to_csv(links, filename):
     """
     Saves the extracted job links to a CSV file.
@@ -93,25 +272,44 @@ def save_links_to_csv(links, filename):
     except Exception as e:
         print(f"Error saving to CSV: {e}")
 
-def main():
+def main(parallel=False, num_workers=4, max_rate=2.0, recycle_after=200, profile="full"):
     search_urls = {
         # "software_engineer": "https://www.simplyhired.com/search?q=software+engineer&l=",
         # "data_scientist": "https://www.simplyhired.com/search?q=data+scientist&l=",
         "ai_ml": "https://www.simplyhired.com/search?q=machine+learning+ai&l=",
     }
 
-    driver = None
+    if parallel:
+        controller = RateController(rate=max_rate, max_rate=max_rate, name=SCRAPER)
+        pool = SessionPool(partial(initialize_driver, profile), size=num_workers, max_pages=recycle_after)
+        pool.warm_up()
+        try:
+            links_by_title = scrape_pages_in_parallel(search_urls, num_workers=num_workers,
+                                                      max_pages=100, controller=controller, pool=pool)
+        finally:
+            pool.close()
+            controller.print_report("Link scraping")
+            pool.print_metrics()
+        for job_title, job_links in links_by_title.items():
+            if job_links:
+                save_links_to_csv(job_links, f"{job_title}_unprocessed_links.csv")
+            else:
+                print(f"⚠ No links found for {job_title.replace('_', ' ')}.")
+        return
+
+    controller = RateController(rate=0.5, max_rate=0.5, name=SCRAPER)
+    pool = SessionPool(partial(initialize_driver, profile), size=1, max_pages=recycle_after)
     try:
-        driver = initialize_driver()
+        pool.warm_up()
 
         for job_title, url in search_urls.items():
             print(f"Scraping {job_title.replace('_', ' ').title()} jobs...")
 
             # For Software Engineer, scrape 100 pages; for others, scrape the default max of 50 pages
             if job_title == "software_engineer":
-                job_links = scrape_all_pages(driver, url, max_pages=100)
+                job_links = scrape_all_pages(None, url, max_pages=100, controller=controller, pool=pool)
             else:
-                job_links = scrape_all_pages(driver, url, max_pages=100)
+                job_links = scrape_all_pages(None, url, max_pages=100, controller=controller, pool=pool)
 
             # Save to CSV
             if job_links:
@@ -120,11 +318,28 @@ def main():
                 print(f"⚠ No links found for {job_title.replace('_', ' ')}.")
 
     finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                print(f"Error while quitting driver: {e}")
+        pool.close()
+        controller.print_report("Link scraping")
+        pool.print_metrics()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Collect SimplyHired job links from search result pages.")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Predict the result page URLs and fetch them concurrently")
+    parser.add_argument("--workers", type=int, default=4, help="Number of browser sessions in parallel mode")
+    parser.add_argument("--max-rate", type=float, default=2.0,
+                        help="Maximum page loads per second across all workers in parallel mode")
+    parser.add_argument("--recycle-after", type=int, default=200,
+                        help="Restart a browser session after this many pages")
+    parser.add_argument("--profile", choices=PROFILES, default="full",
+                        help="Browser profile; 'lean' is headless and blocks images, fonts, CSS and trackers")
+    parser.add_argument("--metrics", default=None,
+                        help="Write run metrics to this file (.prom for Prometheus text, otherwise JSON lines)")
+    args = parser.parse_args()
+    try:
+        with metrics.stage(SCRAPER):
+            main(parallel=args.parallel, num_workers=args.workers, max_rate=args.max_rate,
+                 recycle_after=args.recycle_after, profile=args.profile)
+    finally:
+        if args.metrics:
+            metrics.export(args.metrics)
@@ -0,0 +1,153 @@
+import json
+import os
+import hashlib
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import us  # Import the us library for state abbreviation normalization
+
+# File where resolved locations are kept between runs
+LOCATION_CACHE_FILE = ".location_cache.json"
+
+# Bump when resolve_location changes how it reads a location, so caches written before are ignored
+RESOLVER_VERSION = 2
+
+# Metro area names used in postings instead of a state: alias -> (state abbreviation, metro code)
+METRO_ALIASES = {
+    "san francisco bay area": ("CA", "SF"),
+    "bay area": ("CA", "SF"),
+    "silicon valley": ("CA", "SF"),
+    "greater los angeles area": ("CA", "LA"),
+    "greater san diego area": ("CA", "SD"),
+    "greater seattle area": ("WA", "SEA"),
+    "seattle metropolitan area": ("WA", "SEA"),
+    "washington state": ("WA", None),
+    "new york city": ("NY", "NYC"),
+    "new york city metropolitan area": ("NY", "NYC"),
+    "nyc": ("NY", "NYC"),
+    "greater boston": ("MA", "BOS"),
+    "greater chicago area": ("IL", "CHI"),
+    "dallas-fort worth metroplex": ("TX", "DFW"),
+    "greater houston": ("TX", "HOU"),
+    "austin, texas metropolitan area": ("TX", "AUS"),
+    "washington dc-baltimore area": ("DC", "DC"),
+    "washington dc metro area": ("DC", "DC"),
+    "greater atlanta area": ("GA", "ATL"),
+    "denver metropolitan area": ("CO", "DEN"),
+}
+
+# Cities that belong to a metro area, keyed by "city, state abbreviation"
+CITY_METROS = {
+    "san francisco, CA": "SF", "san jose, CA": "SF", "oakland, CA": "SF", "palo alto, CA": "SF",
+    "cupertino, CA": "SF", "sunnyvale, CA": "SF", "mountain view, CA": "SF", "santa clara, CA": "SF",
+    "san mateo, CA": "SF", "menlo park, CA": "SF", "redwood city, CA": "SF", "fremont, CA": "SF",
+    "los angeles, CA": "LA", "santa monica, CA": "LA", "irvine, CA": "LA", "pasadena, CA": "LA",
+    "san diego, CA": "SD",
+    "seattle, WA": "SEA", "bellevue, WA": "SEA", "redmond, WA": "SEA", "kirkland, WA": "SEA",
+    "new york, NY": "NYC", "brooklyn, NY": "NYC", "jersey city, NJ": "NYC", "hoboken, NJ": "NYC",
+    "boston, MA": "BOS", "cambridge, MA": "BOS", "waltham, MA": "BOS", "burlington, MA": "BOS",
+    "chicago, IL": "CHI",
+    "austin, TX": "AUS", "dallas, TX": "DFW", "fort worth, TX": "DFW", "plano, TX": "DFW",
+    "houston, TX": "HOU",
+    "washington, DC": "DC", "arlington, VA": "DC", "mclean, VA": "DC", "reston, VA": "DC",
+    "herndon, VA": "DC", "chantilly, VA": "DC", "alexandria, VA": "DC", "bethesda, MD": "DC",
+    "atlanta, GA": "ATL", "denver, CO": "DEN", "boulder, CO": "DEN",
+}
+
+def build_state_index():
+    """
+    Precompute lowercase state names and abbreviations -> abbreviation,
+    using exactly what us.states.lookup would return for them.
+    """
+    index = {}
+    for state in us.states.STATES_AND_TERRITORIES + [us.states.DC]:
+        for key in (state.name, state.abbr):
+            match = us.states.lookup(key)
+            if match:
+                index[key.lower()] = match.abbr
+    return index
+
+STATE_INDEX = build_state_index()
+
+def tables_fingerprint():
+    """Hash of the resolver version and the lookup tables; a cache written with other tables is stale."""
+    tables = [RESOLVER_VERSION, METRO_ALIASES, CITY_METROS, STATE_INDEX, getattr(us, '__version__', None)]
+    return hashlib.sha256(json.dumps(tables, sort_keys=True).encode('utf-8')).hexdigest()
+
+# Locations resolved in previous runs (loaded with load_location_cache)
+_known_locations = {}
+
+def load_location_cache(path=LOCATION_CACHE_FILE):
+    """
+    Load the locations resolved in previous runs, unless the cache was written with different lookup
+    tables (or in the old format without a fingerprint): then it is ignored and rewritten on save.
+    """
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            cache = json.load(file)
+        if cache.get('fingerprint') == tables_fingerprint():
+            _known_locations.update({key: tuple(value) for key, value in cache['locations'].items()})
+        else:
+            print(f"⚠ Ignoring '{path}': the location tables changed since it was written.")
+    return len(_known_locations)
+
+def save_location_cache(path=LOCATION_CACHE_FILE):
+    """Save every location resolved so far for the next run, with the fingerprint of the lookup tables."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'fingerprint': tables_fingerprint(), 'locations': _known_locations}, file, indent=0, sort_keys=True)
+
+def _lookup_state(name):
+    """Resolve a state name or abbreviation, falling back to the (slower, fuzzy) us library lookup."""
+    key = name.lower()
+    if key in STATE_INDEX:
+        return STATE_INDEX[key]
+    try:
+        match = us.states.lookup(name)
+    except Exception:
+        return None
+    return match.abbr if match else None
+
+@lru_cache(maxsize=65536)
+def resolve_location(location):
+    """
+    Resolve a raw location string to (state abbreviation or "Remote", metro code or None).
+    """
+    if location in _known_locations:
+        return _known_locations[location]
+
+    result = ("Remote", None)
+    if location and location.strip().lower() in METRO_ALIASES:
+        # Whole-string match first: some metro names contain a comma ("Austin, Texas Metropolitan Area")
+        result = METRO_ALIASES[location.strip().lower()]
+    elif location and 'remote' not in location.lower():
+        parts = [part.strip() for part in location.split(',')]
+        state = parts[-1]  # Get the last part of the location (usually the state)
+
+        if state.lower() in METRO_ALIASES:
+            result = METRO_ALIASES[state.lower()]
+        else:
+            abbr = _lookup_state(state)
+            if abbr:
+                city_key = f"{parts[0].lower()}, {abbr}" if len(parts) > 1 else None
+                metro = CITY_METROS.get(city_key)
+                if metro is None and len(parts) > 1 and parts[0].lower() in METRO_ALIASES:
+                    metro = METRO_ALIASES[parts[0].lower()][1]
+                result = (abbr, metro)
+
+    if location is not None:
+        _known_locations[location] = result
+    return result
+
+def standardize_location_column(values, with_metro=False):
+    """
+    Standardize a whole column of locations, resolving each distinct value only once.
+    Returns a Series of state abbreviations, or a DataFrame with Location and Metro columns if `with_metro`.
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    resolved = [resolve_location(value) for value in uniques] + [resolve_location(None)]
+    states = np.array([state for state, _ in resolved], dtype=object)[codes]
+    if not with_metro:
+        return pd.Series(states, index=values.index)
+    metros = np.array([metro for _, metro in resolved], dtype=object)[codes]
+    return pd.DataFrame({'Location': states, 'Metro': metros}, index=values.index)
@@ -1,239 +1,260 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import MultiLabelBinarizer
-from sklearn.ensemble import RandomForestRegressor
+import os
 import re
+import argparse
+from functools import lru_cache
+from skillfilter import get_skill_filter, RULES_FILE
+from skillaliases import get_canonicalizer, ALIASES_FILE
 
-# Read the data from the new folder (e.g., 'filtered_data.csv')
-df = pd.read_csv('filtered_data.csv')
+# pandas, numpy, sklearn, matplotlib and seaborn are imported on first use so the menu appears right away
 
-# Drop rows with empty values in any column
-df = df.dropna()
+# Read the data from the new folder (e.g., 'filtered_data.csv', or 'filtered_data.parquet' for faster loads)
+DATA_FILE = 'filtered_data.csv'
 
-# Clean the 'Title' column to ensure no leading or trailing spaces
-df['Title'] = df['Title'].str.strip()
+# Job titles analysed and predicted
+JOB_TITLES = ['Software Engineering', 'Data Scientist', 'AI/ML']
 
-# Check unique job titles
-print(df['Title'].unique())
+# Where figures are saved in headless mode
+FIGURES_DIR = 'figures'
 
-# Filter for 'Software Engineering', 'Data Scientist', and 'AI/ML' job titles
-df_combined = df[df['Title'].isin(['Software Engineering', 'Data Scientist', 'AI/ML'])]
+# Set by --headless: render figures to FIGURES_DIR instead of opening windows
+headless = False
 
-# Handle missing values in 'Skills'
-df_combined['Skills'] = df_combined['Skills'].fillna('')
-
-# Define experience keywords to remove exactly (after splitting on semicolon)
-experience_keywords = {'senior', 'entry', 'junior', 'mid-level', 'level', 'under', 'of', 'year'}
-
-# Filter out any skill that exactly matches an experience keyword (ignoring case)
+# Filter out any skill that exactly matches an experience keyword (ignoring case); keywords come from skill_rules.json
 def filter_experience(skills_str):
-    # Split on semicolon to preserve multi-word skills
-    skills = [skill.strip() for skill in skills_str.split(';')]
-    # Filter out skills that are exactly one of the experience keywords
-    filtered_skills = [skill for skill in skills if skill.lower() not in experience_keywords]
-    return filtered_skills
-
-# Apply filtering while preserving semicolon-separated multi-word skills
-df_combined['Skills'] = df_combined['Skills'].apply(filter_experience)
+    return get_skill_filter().filter_experience(skills_str)
+
+@lru_cache(maxsize=None)
+def load_data():
+    """
+    Load the filtered job data for the analysed job titles as a CompactDataset: rows with empty values
+    dropped, titles stripped, skills filtered, canonicalized and interned into the persisted skill vocabulary.
+    """
+    from compactdata import load_compact, print_compact_reduction
+    from features import SkillVocabulary
+
+    # Parquet/Arrow files are memory-mapped; only the columns used here are read
+    vocab = SkillVocabulary.load()
+    dataset = load_compact(DATA_FILE, vocab, titles=JOB_TITLES,
+                           skill_filter=get_skill_filter(), canonicalizer=get_canonicalizer())
+    vocab.save()
+
+    # Check unique job titles
+    print(list(dataset.title.categories))
+
+    # Report how many features canonicalization removed and how much memory the data takes
+    print_compact_reduction(dataset)
+    dataset.print_memory_report()
+    return dataset
+
+@lru_cache(maxsize=None)
+def skill_matrix():
+    """
+    The sparse skill matrix (one column per skill ID), built straight from the dataset's code arrays.
+    Returns (X_filtered, y, feature_names, rows_by_title).
+    """
+    from features import rows_by_value
+
+    dataset = load_data()
+    X = dataset.to_csr()
+    y = dataset.salary.astype('float64')
+
+    # Remove numerical features
+    skills = dataset.vocab.skills
+    filtered_columns = [i for i, skill in enumerate(skills) if not re.match(r'^\d+$', skill)]
+    feature_names = [skills[i] for i in filtered_columns]
+    X_filtered = X[:, filtered_columns]
+
+    # Rows of each job title in X_filtered
+    return X_filtered, y, feature_names, rows_by_value(dataset.title)
+
+@lru_cache(maxsize=None)
+def skill_cube():
+    """Skill counts per (title, skill) and (location, skill), built once for the session."""
+    from skillcube import SkillCube
+    return SkillCube.from_compact(load_data())
 
 # Function to get top 5 skills for each job
-def get_top_5_skills(df_combined):
-    job_titles = df_combined['Title'].unique()
-    top_skills_by_job = {}
-
-    for job_title in job_titles:
-        df_filtered = df_combined[df_combined['Title'] == job_title]
-        # Flatten the list of skills from the 'Skills' column
-        all_skills = [skill for skills_list in df_filtered['Skills'] for skill in skills_list]
-        top_skills = pd.Series(all_skills).value_counts().head(5)
-        top_skills_by_job[job_title] = top_skills
-    
-    return top_skills_by_job
-
-# Get the top 5 skills for each job
-top_skills_by_job = get_top_5_skills(df_combined)
-
-# Create a DataFrame for plotting
-top_skills_df = pd.DataFrame(top_skills_by_job).reset_index()
-top_skills_df = top_skills_df.melt(id_vars=["index"], var_name="Job Title", value_name="Frequency")
-top_skills_df.rename(columns={"index": "Skill"}, inplace=True)
+def top_skills_by_job():
+    return skill_cube().top_k_by(5, 'Title')
+
+@lru_cache(maxsize=None)
+def top_5_features_by_job():
+    """
+    Train the model for each job title concurrently (from row slices of X_filtered) and extract top 5 important features.
+    """
+    from training import MODEL_PARAMS, train_title_models, top_features
+
+    X_filtered, y, feature_names, rows_by_title = skill_matrix()
+    title_models = train_title_models(X_filtered, y, rows_by_title, feature_names, JOB_TITLES, MODEL_PARAMS)
+    return {job: top_features(result, 5) for job, result in title_models.items()}
+
+@lru_cache(maxsize=None)
+def salary_model():
+    """
+    Salary model for the menu: trained once and reused until the data or the hyperparameters change.
+    Returns (model, skill vocabulary the model was trained with).
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from features import SkillVocabulary
+    from modelregistry import ModelRegistry, model_key
+    from training import MODEL_PARAMS
+
+    def train_salary_model():
+        X_filtered, y, feature_names, _ = skill_matrix()
+        model = RandomForestRegressor(**MODEL_PARAMS, n_jobs=-1)
+        model.fit(X_filtered, y)
+        return {'model': model, 'skills': feature_names, 'params': MODEL_PARAMS}
+
+    artifact = ModelRegistry().get_or_train(
+        model_key(DATA_FILE, MODEL_PARAMS, config_files=[RULES_FILE, ALIASES_FILE]),
+        train_salary_model)
+    return artifact['model'], SkillVocabulary(artifact['skills'])
+
+def pyplot():
+    """Import matplotlib (without a window backend in headless mode) and seaborn on first use."""
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+def show_figure(name):
+    """Show the current figure, or save it to FIGURES_DIR/<name>.png in headless mode."""
+    plt, _ = pyplot()
+    if headless:
+        os.makedirs(FIGURES_DIR, exist_ok=True)
+        path = os.path.join(FIGURES_DIR, f"{name}.png")
+        plt.savefig(path, bbox_inches='tight')
+        plt.close()
+        print(f"Figure saved to '{path}'")
+    else:
+        plt.show()
 
 # Visualize the top 5 skills for each job title
-plt.figure(figsize=(10, 6))
-sns.barplot(x="Frequency", y="Skill", hue="Job Title", data=top_skills_df, palette="viridis")
-plt.title("Top 5 Skills for Each Job Title")
-plt.xlabel("Frequency")
-plt.ylabel("Skill")
-plt.legend(title="Job Title", loc="upper right")
-plt.show()
-
-# Clean the 'Title' column to ensure no leading or trailing spaces
-df['Title'] = df['Title'].str.strip()
-
-# Check unique job titles
-print(df['Title'].unique())
-
-# Filter for 'Software Engineering', 'Data Scientist', and 'AI/ML' job titles
-df_combined = df[df['Title'].isin(['Software Engineering', 'Data Scientist', 'AI/ML'])]
-
-# Handle missing values in 'Skills'
-df_combined['Skills'] = df_combined['Skills'].fillna('')
-
-# Define experience keywords to remove exactly (after splitting on semicolon)
-experience_keywords = {'senior', 'entry', 'junior', 'mid-level', 'level', 'under', 'of', 'year'}
-
-# Filter out any skill that exactly matches an experience keyword (ignoring case)
-def filter_experience(skills_str):
-    # Split on semicolon to preserve multi-word skills
-    skills = [skill.strip() for skill in skills_str.split(';')]
-    # Filter out skills that are exactly one of the experience keywords
-    filtered_skills = [skill for skill in skills if skill.lower() not in experience_keywords]
-    return filtered_skills
-
-# Apply filtering while preserving semicolon-separated multi-word skills
-df_combined['Skills'] = df_combined['Skills'].apply(filter_experience)
-
-# Create a MultiLabelBinarizer to transform skills into binary features
-mlb = MultiLabelBinarizer()
-X = df_combined[['Skills']]
-y = df_combined['Salary']
-
-# Transform skills
-temp_df = pd.DataFrame(mlb.fit_transform(X['Skills']), columns=mlb.classes_, index=X.index)
-
-# Remove numerical features
-filtered_columns = [col for col in temp_df.columns if not re.match(r'^\d+$', col)]
-X_filtered = temp_df[filtered_columns]
-
-# Function to train the model for each job title and extract top 5 important features
-def train_and_extract_top_features(df_combined, job_title):
-    # Filter the data by job title
-    df_filtered = df_combined[df_combined['Title'] == job_title]
-
-    # Handle missing 'Skills' and prepare data
-    df_filtered['Skills'] = df_filtered['Skills'].fillna('')
-    X_filtered = pd.DataFrame(mlb.fit_transform(df_filtered['Skills']), columns=mlb.classes_, index=df_filtered.index)
-    y = df_filtered['Salary']
-    
-    # Train Random Forest Regressor
-    model_rf = RandomForestRegressor(n_estimators=100, random_state=42)
-    model_rf.fit(X_filtered, y)
-    
-    # Get feature importances
-    importances = model_rf.feature_importances_
-    feature_importances_df = pd.DataFrame({
-        'Feature': X_filtered.columns,
-        'Importance': importances
-    }).sort_values(by='Importance', ascending=False)
-    
-    # Return top 5 important features
-    return feature_importances_df.head(5)
-
-# Train and extract the top 5 features for each job title
-job_titles = ['Software Engineering', 'Data Scientist', 'AI/ML']
-top_5_features_by_job = {}
-
-for job in job_titles:
-    top_5_features_by_job[job] = train_and_extract_top_features(df_combined, job)
-
-# Print the top 5 features for each job title
-for job, features in top_5_features_by_job.items():
-    print(f"\nTop 5 Features for {job} Salary Prediction:")
-    print(features[['Feature', 'Importance']])
+def plot_top_skills():
+    import pandas as pd
+    plt, sns = pyplot()
+
+    # Create a DataFrame for plotting
+    top_skills_df = pd.DataFrame(top_skills_by_job()).reset_index()
+    top_skills_df = top_skills_df.melt(id_vars=["index"], var_name="Job Title", value_name="Frequency")
+    top_skills_df.rename(columns={"index": "Skill"}, inplace=True)
+
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x="Frequency", y="Skill", hue="Job Title", data=top_skills_df, palette="viridis")
+    plt.title("Top 5 Skills for Each Job Title")
+    plt.xlabel("Frequency")
+    plt.ylabel("Skill")
+    plt.legend(title="Job Title", loc="upper right")
+    show_figure("top_skills")
 
 # Visualize the top 5 features for each job title as bar plots
 def plot_top_5_features_by_job(job, features):
+    plt, sns = pyplot()
     plt.figure(figsize=(8, 6))
     sns.barplot(x='Importance', y='Feature', data=features, palette='viridis')
     plt.title(f"Top 5 Most Important Features for {job} Salary Prediction")
     plt.xlabel('Feature Importance')
     plt.ylabel('Feature')
-    plt.show()
-
-# Visualize the top 5 features for each job title
-for job, features in top_5_features_by_job.items():
-    plot_top_5_features_by_job(job, features)
+    show_figure("top_features_" + re.sub(r'\W+', '_', job).lower())
+
+# Print and visualize the top 5 features for each job title
+def report_top_features():
+    for job, features in top_5_features_by_job().items():
+        print(f"\nTop 5 Features for {job} Salary Prediction:")
+        print(features[['Feature', 'Importance']])
+    for job, features in top_5_features_by_job().items():
+        plot_top_5_features_by_job(job, features)
+
+# Show salary distribution histogram
+def plot_salary_histogram():
+    plt, sns = pyplot()
+    plt.figure(figsize=(8, 6))
+    sns.histplot(load_data().frame()['Salary'], kde=True, color='blue', bins=30)
+    plt.title("Salary Distribution")
+    plt.xlabel("Salary")
+    plt.ylabel("Frequency")
+    show_figure("salary_distribution")
+
+# Show salary distribution by job role
+def plot_salary_by_role():
+    plt, sns = pyplot()
+    plt.figure(figsize=(8, 6))
+    sns.boxplot(x="Title", y="Salary", data=load_data().frame(), palette="Set2")
+    plt.title("Salary Distribution by Job Role")
+    plt.xlabel("Job Role")
+    plt.ylabel("Salary")
+    show_figure("salary_by_role")
+
+def predict_salary():
+    # Get user input for prediction
+    job_title = input("Enter job title (Software Engineering, Data Scientist, AI/ML): ")
+    skills_input = input("Enter skills (separate by semicolon): ")
+
+    # Convert input skills to binary features
+    from features import encode_skills
+    model, model_vocab = salary_model()
+    skills_list = get_canonicalizer().canonicalize(filter_experience(skills_input))
+    input_data = encode_skills(skills_list, model_vocab)
+
+    # Predict salary with the cached model
+    salary_prediction = model.predict(input_data)
+    print(f"Predicted Salary: ${salary_prediction[0]:,.2f}")
+
+# Menu options -> analysis stage; each stage is computed on first use and memoized for the session
+MENU_ACTIONS = {
+    '1': predict_salary,
+    '2': report_top_features,
+    '3': plot_salary_histogram,
+    '4': plot_salary_by_role,
+    '5': plot_top_skills,
+}
 
 # Optional: menu-driven interface
 def menu():
-    print("\nMenu:")
-    print("1. Predict Salary")
-    print("2. Print Top 5 Features by Job Title")
-    print("3. View Salary Distribution (Histogram)")
-    print("4. View Salary Distribution by Job Role (Box Plot)")
-    print("5. View Top 5 Skills for Each Job")
-    print("6. Exit")  # Added Exit option
-    
-    choice = input("Enter your choice: ")
-    
-    if choice == '1':
-        # Get user input for prediction
-        job_title = input("Enter job title (Software Engineering, Data Scientist, AI/ML): ")
-        skills_input = input("Enter skills (separate by semicolon): ")
-        
-        # Convert input skills to binary features
-        skills_list = [skill.strip() for skill in skills_input.split(';')]
-        skills_binary = mlb.transform([skills_list])
-        input_data = pd.DataFrame(skills_binary, columns=mlb.classes_)
-
-        # Train Random Forest on the full dataset (combined) for prediction
-        model_rf_full = RandomForestRegressor(n_estimators=100, random_state=42)
-        model_rf_full.fit(X_filtered, y)
-
-        # Predict salary
-        salary_prediction = model_rf_full.predict(input_data)
-        print(f"Predicted Salary: ${salary_prediction[0]:,.2f}")
-    
-    elif choice == '2':
-        # Print top 5 features for each job title
-        for job, features in top_5_features_by_job.items():
-            print(f"\nTop 5 Features for {job} Salary Prediction:")
-            print(features[['Feature', 'Importance']])
-    
-    elif choice == '3':
-        # Show salary distribution histogram
-        plt.figure(figsize=(8, 6))
-        sns.histplot(df_combined['Salary'], kde=True, color='blue', bins=30)
-        plt.title("Salary Distribution")
-        plt.xlabel("Salary")
-        plt.ylabel("Frequency")
-        plt.show()
-    
-    elif choice == '4':
-        # Show salary distribution by job role
-        plt.figure(figsize=(8, 6))
-        sns.boxplot(x="Title", y="Salary", data=df_combined, palette="Set2")
-        plt.title("Salary Distribution by Job Role")
-        plt.xlabel("Job Role")
-        plt.ylabel("Salary")
-        plt.show()
-    
-    elif choice == '5':
-        # Display top 5 skills for each job title in a bar plot
-        top_skills_by_job = get_top_5_skills(df_combined)
-        top_skills_df = pd.DataFrame(top_skills_by_job).reset_index()
-        top_skills_df = top_skills_df.melt(id_vars=["index"], var_name="Job Title", value_name="Frequency")
-        top_skills_df.rename(columns={"index": "Skill"}, inplace=True)
-
-        # Visualize the top 5 skills for each job title
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x="Frequency", y="Skill", hue="Job Title", data=top_skills_df, palette="viridis")
-        plt.title("Top 5 Skills for Each Job Title")
-        plt.xlabel("Frequency")
-        plt.ylabel("Skill")
-        plt.legend(title="Job Title", loc="upper right")
-        plt.show()
-    
-    elif choice == '6':
-        print("Exiting...")
-        return
-    
-    else:
-        print("Invalid choice. Please try again.")
-    
-    menu()
-
-# Start the menu
-menu()
+    while True:
+        print("\nMenu:")
+        print("1. Predict Salary")
+        print("2. Print Top 5 Features by Job Title")
+        print("3. View Salary Distribution (Histogram)")
+        print("4. View Salary Distribution by Job Role (Box Plot)")
+        print("5. View Top 5 Skills for Each Job")
+        print("6. Exit")  # Added Exit option
+
+        try:
+            choice = input("Enter your choice: ").strip()
+        except EOFError:
+            choice = '6'
+
+        if choice == '6':
+            print("Exiting...")
+            return
+        action = MENU_ACTIONS.get(choice)
+        if action is None:
+            print("Invalid choice. Please try again.")
+            continue
+        action()
+
+def main():
+    global headless, DATA_FILE
+
+    parser = argparse.ArgumentParser(description="Analyse job salaries by skill and predict salaries.")
+    parser.add_argument("--headless", action="store_true", help=f"Save figures to '{FIGURES_DIR}/' instead of showing them")
+    parser.add_argument("--all", action="store_true", help="Run every analysis before the menu (top skills, features, salaries)")
+    parser.add_argument("--no-menu", action="store_true", help="Exit after --all instead of starting the menu")
+    parser.add_argument("--data", default=DATA_FILE, help="Filtered job data: .csv, .parquet or .arrow")
+    args = parser.parse_args()
+    headless = args.headless
+    DATA_FILE = args.data
+
+    if args.all:
+        plot_top_skills()
+        report_top_features()
+        plot_salary_histogram()
+        plot_salary_by_role()
+    if not args.no_menu:
+        menu()
+
+if __name__ == "__main__":
+    main()
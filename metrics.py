@@ -0,0 +1,257 @@
+import json
+import time
+import bisect
+import argparse
+import threading
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from fast HTTP fetches to pages that hit the wait timeout
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0)
+
+# Export files with these extensions are written in Prometheus text format, everything else as JSON lines
+PROMETHEUS_EXTENSIONS = ('.prom', '.txt')
+
+class Histogram:
+    """Bucketed distribution of observed values (Prometheus-style, bounds are inclusive upper limits)."""
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is the +Inf bucket
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile, capped at the largest value seen."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= q * self.count:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self):
+        """[(upper bound, observations <= bound), ...] including +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+def label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+class Metrics:
+    """
+    Thread-safe counters, gauges and histograms keyed by name and labels, shared by the scrapers
+    and the pipeline stages of one run. Exported as JSON lines or Prometheus text.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.gauges = {}
+        self.histograms = {}
+        self.run = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def inc(self, name, value=1, **labels):
+        """Add `value` to a counter."""
+        key = (name, label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name, value, **labels):
+        """Set a gauge."""
+        with self._lock:
+            self.gauges[(name, label_key(labels))] = value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        """Add one observation to a histogram."""
+        key = (name, label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def value(self, name, **labels):
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self.counters.get((name, label_key(labels)), 0)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the duration of the with-block in seconds, also when it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start, **labels)
+
+    def selector(self, scraper, selector, hit, **labels):
+        """Count one selector lookup as a hit or a miss ("N/A"). Returns `hit`."""
+        self.inc('selector_lookups_total', scraper=scraper, selector=selector, result='hit' if hit else 'miss',
+                 **labels)
+        return hit
+
+    def rows(self, stage, count=1):
+        """Count rows read (or items scraped) by a stage."""
+        self.inc('rows_total', count, stage=stage)
+
+    def dropped(self, stage, filter_name, count=1):
+        """Count rows a stage dropped, per filter."""
+        if count:
+            self.inc('rows_dropped_total', count, stage=stage, filter=filter_name)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a pipeline stage. Rows counted with rows(name, ...) inside the with-block
+        give the stage's rows_per_second gauge.
+        """
+        start_rows = self.value('rows_total', stage=name)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            seconds = time.monotonic() - start
+            self.inc('stage_seconds_total', seconds, stage=name)
+            if seconds > 0:
+                rows = self.value('rows_total', stage=name) - start_rows
+                self.gauge('rows_per_second', rows / seconds, stage=name)
+
+    def snapshot(self):
+        """All series as a list of dicts (the JSON lines records)."""
+        with self._lock:
+            records = [{"name": name, "type": "counter", "labels": dict(labels), "value": value}
+                       for (name, labels), value in sorted(self.counters.items())]
+            records += [{"name": name, "type": "gauge", "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.gauges.items())]
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                records.append({
+                    "name": name,
+                    "type": "histogram",
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "max": histogram.max,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "buckets": {format_bound(bound): count for bound, count in histogram.cumulative()},
+                })
+        for record in records:
+            record["run"] = self.run
+        return records
+
+    def to_json_lines(self):
+        return ''.join(json.dumps(record) + '\n' for record in self.snapshot())
+
+    def to_prometheus(self):
+        """The metrics in the Prometheus text exposition format."""
+        lines = []
+        declared = set()
+        for record in self.snapshot():
+            name = record["name"]
+            if name not in declared:
+                lines.append(f"# TYPE {name} {record['type']}")
+                declared.add(name)
+            labels = record["labels"]
+            if record["type"] != "histogram":
+                lines.append(f"{name}{format_labels(labels)} {format_value(record['value'])}")
+                continue
+            for bound, count in record["buckets"].items():
+                lines.append(f"{name}_bucket{format_labels({**labels, 'le': bound})} {count}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(record['sum'])}")
+            lines.append(f"{name}_count{format_labels(labels)} {record['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """
+        Write the metrics to `path`: Prometheus text (overwritten) for .prom/.txt files,
+        otherwise JSON lines appended, so one file collects every run.
+        """
+        if path.lower().endswith(PROMETHEUS_EXTENSIONS):
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(self.to_prometheus())
+        else:
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write(self.to_json_lines())
+        print(f"✅ Metrics saved to '{path}'")
+
+def format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+def format_value(value):
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+def print_summary(records):
+    """Print stage throughput (slowest first), latency percentiles, sleep time, selector miss rates and drops."""
+    def label_text(labels):
+        return ', '.join(f"{name}={value}" for name, value in labels.items())
+
+    by_name = {}
+    for record in records:
+        by_name.setdefault(record["name"], []).append(record)
+
+    for record in sorted(by_name.get("rows_per_second", []), key=lambda r: r["value"]):
+        print(f"Stage {record['labels']['stage']}: {record['value']:,.1f} rows/s")
+    for name in ("page_load_seconds", "request_seconds"):
+        for record in by_name.get(name, []):
+            print(f"{name} [{label_text(record['labels'])}]: {record['count']} observations, "
+                  f"p50 <= {record['p50']:.2f}s, p95 <= {record['p95']:.2f}s, max {record['max']:.2f}s")
+    for record in by_name.get("sleep_seconds_total", []):
+        print(f"Slept {record['value']:.1f}s [{label_text(record['labels'])}]")
+
+    lookups = {}
+    for record in by_name.get("selector_lookups_total", []):
+        labels = {name: value for name, value in record["labels"].items() if name != "result"}
+        hits_misses = lookups.setdefault(tuple(labels.items()), [0, 0])
+        hits_misses[record["labels"]["result"] == "miss"] += record["value"]
+    for labels, (hits, misses) in sorted(lookups.items(), key=lambda item: -item[1][1] / sum(item[1])):
+        flag = " ⚠" if misses > hits else ""
+        print(f"Selector [{label_text(dict(labels))}]: {misses}/{hits + misses} misses{flag}")
+
+    for record in by_name.get("rows_dropped_total", []):
+        print(f"Dropped {record['value']} rows [{label_text(record['labels'])}]")
+
+# Default registry shared by every module of a run
+REGISTRY = Metrics()
+inc = REGISTRY.inc
+gauge = REGISTRY.gauge
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+selector = REGISTRY.selector
+rows = REGISTRY.rows
+dropped = REGISTRY.dropped
+stage = REGISTRY.stage
+export = REGISTRY.export
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the metrics of a run from a JSON lines export.")
+    parser.add_argument("file", help="JSON lines file written with --metrics")
+    parser.add_argument("--run", default=None, help="Run to summarize (default: every run in the file)")
+    args = parser.parse_args()
+
+    with open(args.file, encoding='utf-8') as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    runs = sorted({record["run"] for record in records})
+    for run in [args.run] if args.run else runs:
+        print(f"Run {run}:")
+        print_summary([record for record in records if record["run"] == run])
+
+if __name__ == "__main__":
+    main()
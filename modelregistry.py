@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import time
+import joblib
+import sklearn
+
+# Directory holding trained model artifacts, one file per registry key
+MODEL_DIR = "models"
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def model_key(data_file, params, config_files=()):
+    """
+    Registry key for a model: a hash of the training data, the hyperparameters, the files that
+    shape the features (skill rules, aliases) and the scikit-learn version the model is pickled with.
+    """
+    key = {
+        "data": file_hash(data_file),
+        "params": params,
+        "config": {os.path.basename(path): file_hash(path) for path in config_files},
+        "sklearn": sklearn.__version__,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+class ModelRegistry:
+    """
+    Trained models saved on disk together with their skill vocabulary, keyed by model_key.
+    A model is only retrained when no artifact exists for its key.
+    """
+    def __init__(self, directory=MODEL_DIR):
+        self.directory = directory
+
+    def path_for(self, key, name="model"):
+        return os.path.join(self.directory, f"{name}-{key}.joblib")
+
+    def load(self, key, name="model"):
+        """Returns the artifact saved under `key`, or None if there is none (or it can't be read)."""
+        path = self.path_for(key, name)
+        if not os.path.exists(path):
+            return None
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            print(f"⚠ Could not load model artifact {path}: {e}")
+            return None
+
+    def save(self, key, artifact, name="model"):
+        """Save an artifact under `key`, writing to a temporary file first so a crash never leaves a partial model."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(key, name)
+        joblib.dump(artifact, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        return path
+
+    def latest(self, name="model"):
+        """Returns the most recently saved artifact named `name`, or None if there is none."""
+        if not os.path.isdir(self.directory):
+            return None
+        paths = [os.path.join(self.directory, file) for file in os.listdir(self.directory)
+                 if file.startswith(f"{name}-") and file.endswith(".joblib")]
+        if not paths:
+            return None
+        return joblib.load(max(paths, key=os.path.getmtime))
+
+    def get_or_train(self, key, train, name="model"):
+        """
+        Load the artifact saved under `key`, or call `train()` to build it and save the result.
+        `train` must return a dict, e.g. {"model": fitted_model, "skills": feature_names}.
+        """
+        start = time.perf_counter()
+        artifact = self.load(key, name)
+        if artifact is not None:
+            print(f"✅ Loaded cached {name} {key} in {time.perf_counter() - start:.2f}s")
+            return artifact
+
+        artifact = dict(train())
+        artifact.setdefault("trained_at", time.strftime('%Y-%m-%d %H:%M:%S'))
+        path = self.save(key, artifact, name)
+        print(f"✅ Trained {name} {key} in {time.perf_counter() - start:.2f}s, saved to {path}")
+        return artifact
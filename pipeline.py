@@ -0,0 +1,124 @@
+import csv
+import argparse
+from collections import Counter
+import columnar
+import dedup
+import locations
+import metrics
+import preprocess
+import removeIrrelevantFeatures
+from skillfilter import get_skill_filter
+
+STAGE = "pipeline"
+
+def read_text_chunks(file_path, columns, chunk_size):
+    """Yield chunks of a raw scraped table with every column as plain text ('' for missing values)."""
+    for chunk in columnar.read_table_chunks(file_path, columns, chunk_size):
+        yield chunk.astype(object).where(chunk.notna(), '')
+
+def iter_source_frames(processed_file, flexjobs_file, salary_basis='min', chunk_size=50_000):
+    """Yield preprocessed chunks of both scraped sources, parsed like preprocess.py does by default."""
+    for chunk in read_text_chunks(processed_file, preprocess.PROCESSED_COLUMNS, chunk_size):
+        yield preprocess.prepare_processed_job_frame(chunk, salary_basis)
+    for chunk in read_text_chunks(flexjobs_file, preprocess.FLEXJOBS_COLUMNS, chunk_size):
+        yield preprocess.prepare_flexjobs_frame(chunk, salary_basis)
+
+def iter_source_rows(processed_file, flexjobs_file, salary_basis='min', dedupe=True, chunk_size=50_000):
+    """
+    Yield preprocessed rows (salary normalized, location standardized) from both scraped sources.
+    With `dedupe`, reposts of a job seen earlier in the stream are dropped, as preprocess.py does.
+    """
+    index = dedup.NearDuplicateIndex() if dedupe else None
+    for frame in iter_source_frames(processed_file, flexjobs_file, salary_basis, chunk_size):
+        metrics.rows(STAGE, len(frame))
+        if index:
+            duplicate = index.mask(frame)
+            metrics.dropped(preprocess.STAGE, "near_duplicate", int(duplicate.sum()))
+            frame = frame[~duplicate.to_numpy()]
+        frame = frame[preprocess.FIELDNAMES].astype(object)
+        yield from frame.where(frame.notna(), None).to_dict('records')  # FlexJobs rows have no skills
+
+def write_through(rows, writer):
+    """Write every row to `writer` and pass it on unchanged."""
+    for row in rows:
+        writer.writerow(row)
+        yield row
+
+def filter_skills(rows, skill_filter):
+    """Drop rows without skills and remove useless or duplicate skills from the rest."""
+    for row in rows:
+        if not (row.get('Skills') or '').strip():
+            continue
+        yield removeIrrelevantFeatures.filter_row_skills(row, skill_filter)
+
+def count_row_skills(rows, skills_count):
+    """Add each row's skills to `skills_count` and pass the row on unchanged."""
+    for row in rows:
+        skills_count.update(skill.strip() for skill in row['Skills'].split(';') if skill.strip())
+        yield row
+
+def run_pipeline(processed_file='processed_job_data.csv', flexjobs_file='flexjobs_jobs.csv',
+                 output_file='filtered_data.csv', data_file=None, salary_basis='min', dedupe=True,
+                 chunk_size=50_000):
+    """
+    Stream both sources through preprocessing and skill filtering in a single pass, `chunk_size` rows at a time.
+    Writes `output_file` (and `data_file`, the unfiltered data.csv, if given) and returns
+    the skill counts of the written rows. Memory use does not grow with the input size,
+    except for the near-duplicate index (one MinHash signature per distinct band key) when `dedupe` is on.
+    """
+    skills_count = Counter()
+    data_out = open(data_file, mode='w', newline='', encoding='utf-8') if data_file else None
+    try:
+        with open(output_file, mode='w', newline='', encoding='utf-8') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=preprocess.FIELDNAMES)
+            writer.writeheader()
+
+            rows = iter_source_rows(processed_file, flexjobs_file, salary_basis, dedupe, chunk_size)
+            if data_out:
+                data_writer = csv.DictWriter(data_out, fieldnames=preprocess.FIELDNAMES)
+                data_writer.writeheader()
+                rows = write_through(rows, data_writer)
+            rows = filter_skills(rows, get_skill_filter())
+            rows = count_row_skills(rows, skills_count)
+
+            for row in rows:
+                writer.writerow(row)
+    finally:
+        if data_out:
+            data_out.close()
+
+    return skills_count
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocess and filter the scraped job data in one pass.")
+    parser.add_argument("--processed", default='processed_job_data.csv', help="SimplyHired job data CSV")
+    parser.add_argument("--flexjobs", default='flexjobs_jobs.csv', help="FlexJobs job data CSV")
+    parser.add_argument("--output", default='filtered_data.csv', help="Filtered output CSV")
+    parser.add_argument("--data-csv", default=None, help="Also write the unfiltered rows (data.csv) to this file")
+    parser.add_argument("--salary-basis", choices=['min', 'mid', 'max'], default='min',
+                        help="Which end of a salary range goes into the Salary column")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Keep near-duplicate postings (reposts of the same job) instead of collapsing them")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows preprocessed at a time")
+    parser.add_argument("--metrics", default=None,
+                        help="Write run metrics to this file (.prom for Prometheus text, otherwise JSON lines)")
+    args = parser.parse_args()
+
+    locations.load_location_cache()
+    try:
+        with metrics.stage(STAGE):
+            skills_count = run_pipeline(args.processed, args.flexjobs, args.output, args.data_csv,
+                                        salary_basis=args.salary_basis, dedupe=not args.keep_duplicates,
+                                        chunk_size=args.chunk_size)
+    finally:
+        locations.save_location_cache()
+    if args.metrics:
+        metrics.export(args.metrics)
+    print(f"Filtered data saved to '{args.output}'.")
+
+    print("Skill frequencies after filtering (for inspection):")
+    for skill, count in skills_count.most_common(10):
+        print(f"{skill}: {count}")
+
+if __name__ == "__main__":
+    main()
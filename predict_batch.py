@@ -0,0 +1,135 @@
+import sys
+import json
+import time
+import argparse
+import joblib
+import pandas as pd
+import columnar
+from features import SkillVocabulary, build_skill_matrix
+from modelregistry import ModelRegistry, MODEL_DIR
+from skillaliases import get_canonicalizer
+from skillfilter import get_skill_filter
+
+# Extensions of line-delimited JSON files (one record per line); .json files hold one JSON array of records
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+
+def file_format(path):
+    """'jsonl', 'json' or 'csv', from the file extension."""
+    if path.endswith(JSON_LINES_EXTENSIONS):
+        return 'jsonl'
+    return 'json' if path.endswith('.json') else 'csv'
+
+def read_chunks(input_file, chunk_size):
+    """
+    Yield DataFrames of `chunk_size` rows from a CSV, JSONL or JSON file (chosen by extension).
+    A .json file is one document (an array of records), so it is parsed whole and then split into chunks.
+    """
+    input_format = file_format(input_file)
+    if input_format == 'jsonl':
+        yield from pd.read_json(input_file, lines=True, chunksize=chunk_size, dtype=False)
+    elif input_format == 'json':
+        try:
+            df = pd.read_json(input_file, orient='records', dtype=False)
+        except ValueError as e:
+            raise ValueError(f"'{input_file}' is not a JSON array of records (use .jsonl for JSON lines): {e}") from e
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    else:
+        yield from pd.read_csv(input_file, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+def column(chunk, name):
+    """
+    Returns a chunk's column by name (capitalized or lowercase) as text, or empty strings if it is missing.
+    List values (JSON skill arrays) are joined into the semicolon-separated form CSV files use.
+    """
+    for candidate in (name, name.lower()):
+        if candidate in chunk.columns:
+            values = chunk[candidate].map(lambda value: columnar.join_list(value) if isinstance(value, list) else value)
+            return values.fillna('').astype(str)
+    return pd.Series([''] * len(chunk), index=chunk.index)
+
+def prepare_skills(skills_column):
+    """Run raw skill strings through the same experience filter and canonicalization as training."""
+    skill_filter = get_skill_filter()
+    canonicalizer = get_canonicalizer()
+    return [canonicalizer.canonicalize(skill_filter.filter_experience(skills)) for skills in skills_column]
+
+def predict_chunk(chunk, model, vocab):
+    """Vectorize a whole chunk against the model's vocabulary in one pass and predict its salaries."""
+    X = build_skill_matrix(prepare_skills(column(chunk, 'Skills')), vocab, grow=False)
+    return pd.DataFrame({
+        'Title': column(chunk, 'Title'),
+        'Skills': column(chunk, 'Skills'),
+        'Predicted Salary': model.predict(X).round(2),
+    })
+
+def predict_chunk_incremental(chunk, artifact):
+    """Same as predict_chunk for an incremental artifact: hashed skills and one model per title."""
+    import incremental
+    titles = column(chunk, 'Title')
+    predictions = incremental.predict(artifact, titles.str.strip().to_numpy(), prepare_skills(column(chunk, 'Skills')))
+    return pd.DataFrame({
+        'Title': titles,
+        'Skills': column(chunk, 'Skills'),
+        'Predicted Salary': predictions.round(2),
+    })
+
+def write_chunk(result, output, output_format, header):
+    """Append one chunk of predictions and flush it so downstream readers see it right away."""
+    if output_format == 'jsonl':
+        output.writelines(json.dumps(record) + '\n' for record in result.to_dict('records'))
+    elif output_format == 'json':
+        # Elements of one JSON array: opened by the first chunk, closed by predict_batch
+        output.write(('[\n' if header else ',\n') + ',\n'.join(json.dumps(record) for record in result.to_dict('records')))
+    else:
+        result.to_csv(output, index=False, header=header)
+    output.flush()
+
+def predict_batch(input_file, output_file, artifact, chunk_size=10000):
+    """
+    Predict salaries for every (title, skills) row of `input_file`, streaming the results to `output_file`
+    chunk by chunk. Returns (rows, seconds).
+    """
+    if artifact.get('kind') == 'incremental':
+        predict = lambda chunk: predict_chunk_incremental(chunk, artifact)
+    else:
+        model = artifact['model']
+        vocab = SkillVocabulary(artifact['skills'])
+        predict = lambda chunk: predict_chunk(chunk, model, vocab)
+    output_format = file_format(output_file)
+
+    rows = 0
+    start = time.perf_counter()
+    output = sys.stdout if output_file == '-' else open(output_file, 'w', newline='', encoding='utf-8')
+    try:
+        for chunk in read_chunks(input_file, chunk_size):
+            write_chunk(predict(chunk), output, output_format, header=rows == 0)
+            rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"{rows} rows predicted ({rows / elapsed:,.0f} rows/s)", file=sys.stderr)
+        if output_format == 'json':
+            output.write('\n]\n' if rows else '[]\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return rows, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict salaries for a CSV, JSONL or JSON file of (Title, Skills) rows.")
+    parser.add_argument("input", help="CSV, JSONL (.jsonl/.ndjson) or JSON array (.json) file with Title and Skills columns")
+    parser.add_argument("--output", default='-', help="Output CSV, JSONL or JSON file (default: stdout as CSV)")
+    parser.add_argument("--model", default=None, help="Model artifact file (default: latest in the model registry)")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Model registry directory")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows read and predicted per batch")
+    args = parser.parse_args()
+
+    artifact = joblib.load(args.model) if args.model else ModelRegistry(args.model_dir).latest()
+    if artifact is None:
+        parser.error(f"No trained model in '{args.model_dir}'; run main.py first or pass --model")
+
+    rows, elapsed = predict_batch(args.input, args.output, artifact, args.chunk_size)
+    print(f"✅ Predicted {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
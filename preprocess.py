@@ -1,6 +1,41 @@
 import csv
 import re
-import us  # Import the us library for state abbreviation normalization
+import argparse
+import numpy as np
+import pandas as pd
+import locations
+import columnar
+import metrics
+import dedup
+
+# Name of this stage in the run metrics
+STAGE = "preprocess"
+
+# One compiled pattern for every salary format seen in the scraped data, e.g.
+# "$137,100 - $201,600 a year", "Estimated: $125K - $160K a year", "From $20 an hour",
+# "120,000 - 140,000 USD Annually". Input is lowercased with commas removed first.
+SALARY_PATTERN = re.compile(r"""
+    (?P<symbol>[$€£])?\s*
+    (?P<low>\d+(?:\.\d+)?)\s*(?P<low_k>k\b)?
+    (?:\s*(?:-|–|to)\s*[$€£]?\s*(?P<high>\d+(?:\.\d+)?)\s*(?P<high_k>k\b)?)?
+    \s*(?P<code>usd|eur|gbp|cad|aud|sek|inr)?
+    \s*(?:a|an|per|/)?\s*
+    (?P<period>hour|hourly|day|daily|week|weekly|month|monthly|year|yearly|annually|annual|annum)?
+""", re.VERBOSE)
+
+# Normalized pay period for each period word, and the factor converting it to a yearly salary
+PERIOD_UNITS = {
+    'hour': 'hour', 'hourly': 'hour',
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'weekly': 'week',
+    'month': 'month', 'monthly': 'month',
+    'year': 'year', 'yearly': 'year', 'annually': 'year', 'annual': 'year', 'annum': 'year',
+}
+PERIOD_MULTIPLIERS = {'hour': 2000, 'day': 250, 'week': 50, 'month': 12, 'year': 1}
+CURRENCY_SYMBOLS = {'$': 'USD', '€': 'EUR', '£': 'GBP'}
+
+# Yearly amounts below this are placeholders such as "$1 a year" and are rejected, like extract_salary rejects 0
+MIN_YEARLY_SALARY = 1000
 
 def extract_salary(salary):
     """Extract and normalize salary from various formats."""
@@ -25,55 +60,98 @@ def extract_salary(salary):
 
     return None
 
-def standardize_location(location):
-    """Standardize location names, converting state names to abbreviations or marking remote jobs."""
-    if not location:
-        return "Remote"
-    
-    if 'remote' in location.lower():
-        return "Remote"
+def normalize_salary_column(values):
+    """
+    Parse a whole column of salary strings at once.
+    Returns a DataFrame (same index) with float columns salary_min, salary_max and salary_mid,
+    all converted to yearly amounts, plus categorical salary_unit and salary_currency columns.
+    Amounts without a pay period below 250 are treated as hourly, like extract_salary. Unlike
+    extract_salary, daily, weekly and monthly amounts are converted to yearly ones, and rows whose
+    yearly minimum is below MIN_YEARLY_SALARY are rejected (all columns missing).
+    """
+    values = pd.Series(values)
 
-    try:
-        location_parts = location.split(',')
-        location = location_parts[-1].strip()  # Get the last part of the location (usually the state)
+    # Salary strings repeat a lot, so parse each distinct string only once
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype='string').str.lower().str.replace(',', '', regex=False)
+    parts = text.str.extract(SALARY_PATTERN)
 
-        # Attempt to match the state abbreviation using the us library
-        normalized_location = us.states.lookup(location)
+    low = pd.to_numeric(parts['low'], errors='coerce')
+    high = pd.to_numeric(parts['high'], errors='coerce')
+    low = low.where(parts['low_k'].isna(), low * 1000)
+    high = high.where(parts['high_k'].isna(), high * 1000)
+    # "100 - 130K": the K applies to both ends of the range
+    low = low.where(~(parts['low_k'].isna() & parts['high_k'].notna() & (low < 1000)), low * 1000)
+    high = high.fillna(low)
 
-        if normalized_location:
-            return normalized_location.abbr  # Return the state abbreviation
-        else:
-            return "Remote"
-    except Exception:
-        return "Remote"
+    unit = parts['period'].map(PERIOD_UNITS)
+    unit = unit.where(unit.notna() | ~(low < 250), 'hour')
+    unit = unit.fillna('year')
+    low = low.where(low * unit.map(PERIOD_MULTIPLIERS) >= MIN_YEARLY_SALARY)
+    unit = unit.where(low.notna())
+    multiplier = unit.map(PERIOD_MULTIPLIERS).astype(float)
 
-def process_processed_job_data(file_path):
-    """Preprocess job data from processed_job_data.csv."""
-    data = []
+    currency = parts['symbol'].map(CURRENCY_SYMBOLS).fillna(parts['code'].str.upper()).fillna('USD')
+    currency = currency.where(low.notna())
+
+    salary_min = (low * multiplier).round(2)
+    salary_max = (high * multiplier).round(2)
+    parsed = pd.DataFrame({
+        'salary_min': salary_min.astype('float64'),
+        'salary_max': salary_max.astype('float64'),
+        'salary_mid': ((salary_min + salary_max) / 2).round(2).astype('float64'),
+        'salary_unit': unit.astype(object),
+        'salary_currency': currency.astype(object),
+    })
+
+    # Broadcast the parsed distinct values back to every row (code -1 marks missing values)
+    parsed.loc[len(parsed)] = [np.nan, np.nan, np.nan, None, None]
+    codes = np.where(codes < 0, len(parsed) - 1, codes)
+    result = parsed.iloc[codes].set_index(values.index)
+    result['salary_unit'] = result['salary_unit'].astype('category')
+    result['salary_currency'] = result['salary_currency'].astype('category')
+    return result
+
+def standardize_location(location):
+    """Standardize location names, converting state names to abbreviations or marking remote jobs."""
+    return locations.resolve_location(location)[0]
+
+def iter_processed_job_data(file_path):
+    """Yield preprocessed rows from processed_job_data.csv one at a time."""
+    read = kept = 0
     with open(file_path, mode='r', newline='', encoding='utf-8') as file:
         reader = csv.DictReader(file)
         for row in reader:
+            read += 1
             salary = extract_salary(row.get('Salary', ''))
             if salary:
+                kept += 1
                 location = standardize_location(row.get('Location', ''))
                 jobtitle = row.get('Job Name', 'Software Engineering')  # Default to Software Engineering if missing
                 
-                data.append({
+                yield {
                     'Title': jobtitle,
                     'Location': location,
                     'Skills': row.get('Qualifications', None),
                     'Salary': salary
-                })
-    return data
+                }
+    metrics.rows(STAGE, read)
+    metrics.dropped(STAGE, "no_salary", read - kept)
 
-def process_flexjobs(file_path):
-    """Preprocess job data from flexjobs_jobs.csv with job title renaming."""
-    data = []
+def process_processed_job_data(file_path):
+    """Preprocess job data from processed_job_data.csv."""
+    return list(iter_processed_job_data(file_path))
+
+def iter_flexjobs(file_path):
+    """Yield preprocessed rows from flexjobs_jobs.csv one at a time, with job title renaming."""
+    read = kept = 0
     with open(file_path, mode='r', newline='', encoding='utf-8') as file:
         reader = csv.DictReader(file)
         for row in reader:
+            read += 1
             salary = extract_salary(row.get('Salary Range', ''))
             if salary:
+                kept += 1
                 location = standardize_location(row.get('Remote Option', ''))
                 jobtitle = row.get('Job Title', 'Software Engineering').strip()  # Use job title or default
                 
@@ -83,29 +161,127 @@ def process_flexjobs(file_path):
                 elif jobtitle.lower() == "software engineer":
                     jobtitle = "Software Engineering"
 
-                data.append({
+                yield {
                     'Title': jobtitle,
                     'Location': location,
                     'Skills': None,  # FlexJobs does not have qualifications
                     'Salary': salary
-                })
-    return data
+                }
+    metrics.rows(STAGE, read)
+    metrics.dropped(STAGE, "no_salary", read - kept)
+
+def process_flexjobs(file_path):
+    """Preprocess job data from flexjobs_jobs.csv with job title renaming."""
+    return list(iter_flexjobs(file_path))
+
+FIELDNAMES = ['Title', 'Location', 'Skills', 'Salary']
+
+def build_frame(titles, job_locations, skills, salaries, salary_basis):
+    """Assemble the output columns, keeping only rows with a parsed, non-zero salary."""
+    salary = salaries[f'salary_{salary_basis}']
+    frame = pd.DataFrame({
+        'Title': titles,
+        'Location': locations.standardize_location_column(job_locations),
+        'Skills': skills,
+        'Salary': salary,
+    })
+    keep = salary.notna() & (salary != 0)
+    metrics.rows(STAGE, len(frame))
+    metrics.dropped(STAGE, "no_salary", int((~keep).sum()))
+    return frame[keep]
+
+# Raw columns read from each scraped source
+PROCESSED_COLUMNS = ['Job Name', 'Location', 'Salary', 'Qualifications']
+FLEXJOBS_COLUMNS = ['Job Title', 'Remote Option', 'Salary Range']
+
+def process_processed_job_frame(file_path, salary_basis='min'):
+    """Vectorized version of process_processed_job_data returning a DataFrame."""
+    return prepare_processed_job_frame(columnar.read_text_table(file_path, columns=PROCESSED_COLUMNS), salary_basis)
+
+def prepare_processed_job_frame(df, salary_basis='min'):
+    """Preprocess a text DataFrame (or chunk) of processed_job_data.csv."""
+    salaries = normalize_salary_column(df['Salary'])
+    return build_frame(df['Job Name'], df['Location'], df['Qualifications'], salaries, salary_basis)
+
+def process_flexjobs_frame(file_path, salary_basis='min'):
+    """Vectorized version of process_flexjobs returning a DataFrame."""
+    return prepare_flexjobs_frame(columnar.read_text_table(file_path, columns=FLEXJOBS_COLUMNS), salary_basis)
+
+def prepare_flexjobs_frame(df, salary_basis='min'):
+    """Preprocess a text DataFrame (or chunk) of flexjobs_jobs.csv, with job title renaming."""
+    salaries = normalize_salary_column(df['Salary Range'])
+
+    # Rename job titles
+    titles = df['Job Title'].str.strip()
+    lowered = titles.str.lower()
+    titles = titles.mask(lowered == "machine learning engineer", "AI/ML")
+    titles = titles.mask(lowered == "software engineer", "Software Engineering")
+
+    skills = pd.Series(None, index=df.index, dtype=object)  # FlexJobs does not have qualifications
+    return build_frame(titles, df['Remote Option'], skills, salaries, salary_basis)
 
 def write_to_csv(data, output_file):
     """Write processed job data to a CSV file."""
     with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=['Title', 'Location', 'Skills', 'Salary'])
+        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
         writer.writeheader()
         for row in data:
             writer.writerow(row)
 
-def main():
-    processed_data = process_processed_job_data('processed_job_data.csv')
-    flexjobs_data = process_flexjobs('flexjobs_jobs.csv')
+def drop_duplicate_postings(frame):
+    """Collapse reposts of the same job (within and across sources) to their first row."""
+    frame, duplicates = dedup.drop_near_duplicates(frame)
+    metrics.dropped(STAGE, "near_duplicate", duplicates)
+    print(f"Dropped {duplicates} near-duplicate postings.")
+    return frame
+
+def main(salary_basis='min', vectorized=True, processed_file='processed_job_data.csv',
+         flexjobs_file='flexjobs_jobs.csv', output_file='data.csv', dedupe=True):
+    locations.load_location_cache()
+    try:
+        run(salary_basis, vectorized, processed_file, flexjobs_file, output_file, dedupe)
+    finally:
+        locations.save_location_cache()
+
+def run(salary_basis='min', vectorized=True, processed_file='processed_job_data.csv',
+        flexjobs_file='flexjobs_jobs.csv', output_file='data.csv', dedupe=True):
+    if not vectorized:
+        processed_data = process_processed_job_data(processed_file)
+        flexjobs_data = process_flexjobs(flexjobs_file)
+
+        combined_data = processed_data + flexjobs_data  # Merge datasets
+        if dedupe:
+            kept = drop_duplicate_postings(pd.DataFrame(combined_data, columns=FIELDNAMES))
+            combined_data = [combined_data[i] for i in kept.index]
 
-    combined_data = processed_data + flexjobs_data  # Merge datasets
+        write_to_csv(combined_data, output_file)
+        return
 
-    write_to_csv(combined_data, 'data.csv')
+    combined_data = pd.concat([
+        process_processed_job_frame(processed_file, salary_basis),
+        process_flexjobs_frame(flexjobs_file, salary_basis),
+    ], ignore_index=True)  # Merge datasets
+    if dedupe:
+        combined_data = drop_duplicate_postings(combined_data)
+    # CSV, or Parquet/Arrow (typed salary, dictionary-encoded Title/Location, skill lists) by extension
+    columnar.write_table(combined_data[FIELDNAMES], output_file)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Preprocess the scraped job data into data.csv.")
+    parser.add_argument("--salary-basis", choices=['min', 'mid', 'max'], default='min',
+                        help="Which end of a salary range goes into the Salary column")
+    parser.add_argument("--row-by-row", action="store_true",
+                        help="Use the original row-by-row parser instead of the vectorized one")
+    parser.add_argument("--processed", default='processed_job_data.csv', help="SimplyHired job data (CSV or Parquet)")
+    parser.add_argument("--flexjobs", default='flexjobs_jobs.csv', help="FlexJobs job data (CSV or Parquet)")
+    parser.add_argument("--output", default='data.csv', help="Output file: .csv, .parquet or .arrow")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Keep near-duplicate postings (reposts of the same job) instead of collapsing them")
+    parser.add_argument("--metrics", default=None,
+                        help="Write run metrics to this file (.prom for Prometheus text, otherwise JSON lines)")
+    args = parser.parse_args()
+    with metrics.stage(STAGE):
+        main(salary_basis=args.salary_basis, vectorized=not args.row_by_row, processed_file=args.processed,
+             flexjobs_file=args.flexjobs, output_file=args.output, dedupe=not args.keep_duplicates)
+    if args.metrics:
+        metrics.export(args.metrics)
@@ -1,27 +1,19 @@
 import csv
+import argparse
 from collections import Counter
-import re
+import columnar
+import metrics
+from skillfilter import get_skill_filter
 
-def count_skills(file_path):
+# Exclusion patterns and useless skills are defined once in skill_rules.json
+skill_filter = get_skill_filter()
+
+# Name of this stage in the run metrics
+STAGE = "filter_skills"
+
+def count_skills(file_path, skill_filter=skill_filter):
     """Count the frequency of skills in the data.csv file."""
     skills_count = Counter()
-
-    # Define patterns to ignore (e.g., experience level, years of experience, etc.)
-    exclude_keywords = [
-        r'\d+\+? years',         # Match patterns like "11+ years"
-        r'level',                # Exclude keywords like "senior", "junior"
-        r'entry',                # Exclude entry level
-        r'mid-level',            # Exclude mid-level
-        r'senior',               # Exclude senior level
-        r'under \d+ year',       # Exclude "under 1 year" or similar
-        r'\b(?:bachelor|master|ph\.d|degree|diploma)\b',  # Exclude educational qualifications
-        r'\b(?:license|certification)\b',  # Exclude license/certification-related phrases
-        r'program management',   # Exclude program management, irrelevant as a skill
-        r'windows',              # Exclude platform-related terms, often not a skill itself
-        r'microsoft office',     # Exclude suite of programs (e.g., Word, Excel) as they are too general
-        r'powerpoint'            # Exclude PowerPoint, which is often just a tool, not a skill
-    ]
-    exclusion_pattern = '|'.join(exclude_keywords)
     
     with open(file_path, mode='r', newline='', encoding='utf-8') as file:
         reader = csv.DictReader(file)
@@ -33,62 +25,48 @@ def count_skills(file_path):
         for row in reader:
             skills = row.get('Skills', '')
             if skills:
-                # Clean out non-skill parts using regex
-                skills_cleaned = re.sub(exclusion_pattern, '', skills, flags=re.IGNORECASE)
-                # Split skills by semicolon and standardize them
-                skills_list = [skill.strip().lower() for skill in skills_cleaned.split(';') if skill.strip()]
-                skills_count.update(skills_list)
+                # Clean out non-skill parts and split skills by semicolon in one pass
+                skills_count.update(skill_filter.clean(skills))
     
     return skills_count
 
-def filter_row_skills(row, useless_set, exclusion_pattern):
+def filter_row_skills(row, skill_filter=skill_filter):
     """
-    Update the row's Skills field by removing any skill that appears in the useless_set.
+    Update the row's Skills field by removing any skill that appears in the useless skills.
     Also removes duplicate skills in the same row.
     """
     skills = row.get('Skills', '')
     if skills:
-        # Clean the skills using the same exclusion pattern as above.
-        skills_cleaned = re.sub(exclusion_pattern, '', skills, flags=re.IGNORECASE)
-        skills_list = [skill.strip().lower() for skill in skills_cleaned.split(';') if skill.strip()]
-        # Remove duplicates by converting the list to a set and back to a list
-        skills_list = list(set(skills_list))
-        # Filter out any skills that are in the useless_set
-        filtered_skills = [skill for skill in skills_list if skill not in useless_set]
-        row['Skills'] = '; '.join(filtered_skills)
+        # Clean, deduplicate and drop useless skills using the same rules as count_skills
+        row['Skills'] = '; '.join(skill_filter.filter(skills))
     return row
 
-def main():
-    input_file = 'data.csv'
-    output_file = 'filtered_data.csv'
-    
-    # Define a set of useless skills (adjust as needed)
-    useless_set = {
-        "'s", "of science", "doctoral", "doctor of philosophy", "1 year",
-        "of business administration", "bachelor", "master", "ph.d", "degree",
-        "diploma", "license", "certification", "microsoft office", "powerpoint", "windows",
-        "leadership", "associate's", "mentoring", "teaching", 'product management', 'microsoft'
-        , 'microsoft word', 'powershell', "driver's", 'snowflake', 'pki', 'journalism', 'transcription'
-        , 'grammar experience', 'high school  or ged', 'copywriting', 'host/hostess experience', 'go', "growing experience", 'english', 'writing skills'
-    }
+def filter_table(input_file, output_file, skill_filter=skill_filter):
+    """
+    Filter a Parquet/Arrow (or CSV) table in one vectorized pass and return the skill counts after filtering.
+    Only reads the columns of the output schema; skills stay lists end to end for columnar files.
+    """
+    df = columnar.read_table(input_file, columns=['Title', 'Location', 'Skills', 'Salary'])
+    # Drop row if 'Skills' field is empty (None in Parquet/Arrow, NaN or blank in CSV)
+    keep = df['Skills'].map(lambda value: value is not None and not isinstance(value, float)
+                            and (not isinstance(value, str) or bool(value.strip())))
+    metrics.rows(STAGE, len(df))
+    metrics.dropped(STAGE, "empty_skills", int((~keep).sum()))
+    df = df[keep]
+    df = df.assign(Skills=df['Skills'].map(skill_filter.filter))
+    columnar.write_table(df, output_file)
+    return Counter(skill for row in df['Skills'] for skill in row)
+
+def filter_file(input_file, output_file):
+    """Filter `input_file` into `output_file` and print the most frequent skills left."""
+    if columnar.is_columnar(input_file) or columnar.is_columnar(output_file):
+        skills_count = filter_table(input_file, output_file)
+        print(f"Filtered data saved to '{output_file}'.")
+        print("Skill frequencies after filtering (for inspection):")
+        for skill, count in skills_count.most_common(10):
+            print(f"{skill}: {count}")
+        return
 
-    # Use the same exclusion pattern as in count_skills
-    exclude_keywords = [
-        r'\d+\+? years',
-        r'level',
-        r'entry',
-        r'mid-level',
-        r'senior',
-        r'under \d+ year',
-        r'\b(?:bachelor|master|ph\.d|degree|diploma)\b',
-        r'\b(?:license|certification)\b',
-        r'program management',
-        r'windows',
-        r'microsoft office',
-        r'powerpoint'
-    ]
-    exclusion_pattern = '|'.join(exclude_keywords)
-    
     # Process the CSV file and update each row's Skills field to remove useless skills and duplicates
     with open(input_file, mode='r', newline='', encoding='utf-8') as infile, \
          open(output_file, mode='w', newline='', encoding='utf-8') as outfile:
@@ -97,13 +75,18 @@ def main():
         writer = csv.DictWriter(outfile, fieldnames=fieldnames)
         writer.writeheader()
         
+        read = dropped = 0
         for row in reader:
+            read += 1
             # Drop row if 'Skills' field is empty
             if not row.get('Skills', '').strip():
+                dropped += 1
                 continue
-            filtered_row = filter_row_skills(row, useless_set, exclusion_pattern)
+            filtered_row = filter_row_skills(row)
             writer.writerow(filtered_row)
-    
+    metrics.rows(STAGE, read)
+    metrics.dropped(STAGE, "empty_skills", dropped)
+
     print(f"Filtered data saved to '{output_file}'.")
 
     # Re-count skills after filtering
@@ -112,5 +95,17 @@ def main():
     for skill, count in skills_count.most_common(10):
         print(f"{skill}: {count}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Remove useless and duplicate skills from the preprocessed job data.")
+    parser.add_argument("--input", default='data.csv', help="Input file: .csv, .parquet or .arrow")
+    parser.add_argument("--output", default='filtered_data.csv', help="Output file: .csv, .parquet or .arrow")
+    parser.add_argument("--metrics", default=None,
+                        help="Write run metrics to this file (.prom for Prometheus text, otherwise JSON lines)")
+    args = parser.parse_args()
+    with metrics.stage(STAGE):
+        filter_file(args.input, args.output)
+    if args.metrics:
+        metrics.export(args.metrics)
+
 if __name__ == "__main__":
     main()
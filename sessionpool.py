@@ -0,0 +1,299 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+import undetected_chromedriver as uc
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+# File remembering where ChromeDriverManager put the driver binary
+DRIVER_PATH_CACHE = ".chromedriver_path"
+
+# Browser profiles: "full" loads every asset, "lean" only what is needed to read text
+PROFILES = ("full", "lean")
+
+# URL patterns blocked at the network layer by the lean profile
+LEAN_BLOCKED_URLS = [
+    # Images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg",
+    # Fonts and stylesheets
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css",
+    # Analytics, ads and other third-party trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*segment.io*", "*segment.com*",
+    "*newrelic.com*", "*nr-data.net*", "*optimizely.com*", "*quantserve.com*", "*scorecardresearch.com*",
+    "*bat.bing.com*", "*clarity.ms*", "*linkedin.com/px*", "*ads.linkedin.com*", "*tiktok.com*",
+]
+
+# Sums the bytes fetched for the current document and its subresources.
+# Cross-origin resources without Timing-Allow-Origin report 0, so this is a lower bound.
+PAGE_BYTES_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+let total = 0;
+for (const entry of entries) { total += entry.transferSize || 0; }
+return total;
+"""
+
+_driver_path_lock = threading.Lock()
+
+def cached_driver_path(cache_file=DRIVER_PATH_CACHE):
+    """
+    Returns the chromedriver binary path, resolving it with ChromeDriverManager only
+    when no cached path exists yet (or the cached binary is gone).
+    """
+    with _driver_path_lock:
+        if os.path.exists(cache_file):
+            with open(cache_file, encoding='utf-8') as file:
+                path = file.read().strip()
+            if path and os.path.exists(path):
+                return path
+
+        path = ChromeDriverManager().install()
+        with open(cache_file, 'w', encoding='utf-8') as file:
+            file.write(path)
+        return path
+
+def apply_lean_options(options):
+    """
+    Configure Chrome options for the lean profile: headless, eager page loads and no images.
+    """
+    options.page_load_strategy = "eager"  # Return once the DOM is ready, without waiting for subresources
+    options.add_argument("--headless=new")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    return options
+
+def enable_request_blocking(driver):
+    """
+    Block images, media, fonts, stylesheets and analytics domains at the network layer.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    # Keep every resource timing entry so page_bytes_transferred sees the whole page
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                           {"source": "performance.setResourceTimingBufferSize(10000);"})
+    return driver
+
+def page_bytes_transferred(driver):
+    """
+    Returns the number of bytes transferred for the page currently loaded in `driver`.
+    """
+    try:
+        return int(driver.execute_script(PAGE_BYTES_SCRIPT) or 0)
+    except WebDriverException:
+        return 0
+
+def create_uc_driver(profile="full"):
+    """
+    Initialize undetected Chrome WebDriver.
+    """
+    options = uc.ChromeOptions()
+    options.headless = False  # Set True if you want headless mode
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    if profile == "lean":
+        apply_lean_options(options)
+
+    driver = uc.Chrome(service=Service(cached_driver_path()), options=options)
+    if profile == "lean":
+        enable_request_blocking(driver)
+    return driver
+
+def create_chrome_driver(profile="full"):
+    """
+    Initialize a regular Selenium Chrome WebDriver.
+    """
+    options = webdriver.ChromeOptions()
+    if profile == "lean":
+        apply_lean_options(options)
+
+    driver = webdriver.Chrome(service=Service(cached_driver_path()), options=options)
+    if profile == "lean":
+        enable_request_blocking(driver)
+    return driver
+
+class SessionPool:
+    """
+    Pool of warm browser sessions shared by the workers of a scraper.
+    Each lease counts as one page; a session is recycled after `max_pages` leases
+    or when a WebDriverException escapes its lease (crashed or hung browser).
+    """
+    def __init__(self, driver_factory=create_uc_driver, size=1, max_pages=200):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages = max_pages
+
+        self._idle = []  # Reuse the most recently used (warmest) session first
+        # Guards the fields below; notified whenever a session goes idle or a slot frees up
+        self._lock = threading.Condition()
+        self._pages = {}  # id(driver) -> pages served
+        self._open = 0
+        self._closed = False
+
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.leases = 0
+        self.startup_seconds = 0.0
+        self.lease_wait_seconds = 0.0
+        self.pages_measured = 0
+        self.bytes_transferred = 0
+
+    def _create(self):
+        start = time.monotonic()
+        driver = self.driver_factory()
+        with self._lock:
+            self.created += 1
+            self.startup_seconds += time.monotonic() - start
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _put_idle(self, driver):
+        with self._lock:
+            self._idle.append(driver)
+            self._lock.notify()
+
+    def _free_slot(self):
+        with self._lock:
+            self._open -= 1
+            self._lock.notify()  # A waiting acquire can now start a replacement
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        self._free_slot()
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error while quitting driver: {e}")
+
+    def warm_up(self, count=None):
+        """
+        Start `count` sessions (default: the pool size) in parallel so the first leases don't wait on Chrome.
+        """
+        count = min(count or self.size, self.size)
+        with self._lock:
+            count = max(0, count - self._open)
+            self._open += count
+
+        def start_one():
+            try:
+                self._put_idle(self._create())
+            except Exception as e:
+                self._free_slot()
+                print(f"Error while starting browser session: {e}")
+
+        threads = [threading.Thread(target=start_one) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def acquire(self):
+        """
+        Lease a session: an idle one if available, a new one if the pool isn't full, otherwise wait.
+        """
+        start = time.monotonic()
+        with self._lock:
+            # Discarded (recycled or crashed) sessions free their slot, so a waiter may create the replacement
+            while not self._idle and self._open >= self.size:
+                self._lock.wait()
+            driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                self._open += 1
+        if driver is None:
+            try:
+                driver = self._create()
+            except Exception:
+                self._free_slot()
+                raise
+        with self._lock:
+            self.leases += 1
+            self.lease_wait_seconds += time.monotonic() - start
+        return driver
+
+    def release(self, driver, crashed=False):
+        """
+        Return a leased session, recycling it if it crashed or has served `max_pages` pages.
+        """
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+            worn_out = self._pages[id(driver)] >= self.max_pages
+            if crashed:
+                self.crashed += 1
+            elif worn_out:
+                self.recycled += 1
+            closed = self._closed
+
+        if crashed or worn_out or closed:
+            self._discard(driver)
+        else:
+            self._put_idle(driver)
+
+    @contextmanager
+    def session(self):
+        """
+        Lease a session for the duration of the with-block.
+        """
+        driver = self.acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            self.release(driver, crashed=True)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        self.release(driver)
+
+    def record_page_weight(self, driver):
+        """
+        Add the bytes transferred for the page loaded in `driver` to the pool totals.
+        """
+        page_bytes = page_bytes_transferred(driver)
+        with self._lock:
+            self.pages_measured += 1
+            self.bytes_transferred += page_bytes
+        return page_bytes
+
+    def close(self):
+        """
+        Quit every idle session. Sessions still leased are quit when they are released.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def metrics(self):
+        """
+        Returns pool counters: sessions created, recycled and crashed, leases and time spent starting or waiting.
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "created": self.created,
+                "recycled": self.recycled,
+                "crashed": self.crashed,
+                "leases": self.leases,
+                "startup_seconds": round(self.startup_seconds, 2),
+                "lease_wait_seconds": round(self.lease_wait_seconds, 2),
+                "pages_measured": self.pages_measured,
+                "bytes_transferred": self.bytes_transferred,
+                "avg_bytes_per_page": round(self.bytes_transferred / self.pages_measured) if self.pages_measured else 0,
+            }
+
+    def print_metrics(self, label="Session pool"):
+        m = self.metrics()
+        print(f"{label}: {m['created']} sessions started ({m['startup_seconds']}s), "
+              f"{m['recycled']} recycled, {m['crashed']} crashed, {m['leases']} leases, "
+              f"waited {m['lease_wait_seconds']}s for a session")
+        if m['pages_measured']:
+            print(f"{label}: {m['bytes_transferred'] / 1e6:.1f} MB over {m['pages_measured']} pages, "
+                  f"{m['avg_bytes_per_page'] / 1e3:.1f} KB per page")
@@ -1,31 +1,148 @@
 import time
 import csv
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
 import os
+import argparse
+from functools import partial
+import jobstore
+import dedup
+import metrics
+from throttle import RateController, wait_for_element
+from sessionpool import SessionPool, PROFILES, create_uc_driver
+import queue
+import threading
 
-def initialize_driver():
+# Define the job files and their corresponding job titles
+JOB_FILES = [
+    ("ai_ml_unprocessed_links.csv", "AI/ML"),
+    ("data_scientist_unprocessed_links.csv", "Data Scientist"),
+    ("software_engineer_unprocessed_links.csv", "Software Engineering")
+]
+
+OUTPUT_FILE = "processed_job_data.csv"
+
+# Name of this scraper in the run metrics
+SCRAPER = "simplyjobs"
+
+# Fields that must be present in the raw HTML before the browser fallback is skipped.
+# "Job Name" is not one of them: main replaces it with the title of the job link file.
+# Salary is often missing from fully rendered pages too, so it doesn't count either.
+REQUIRED_FIELDS = ("Location", "Qualifications")
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+def initialize_driver(profile="full"):
     """
     Initialize undetected Chrome WebDriver.
     """
-    options = uc.ChromeOptions()
-    options.headless = False  # Set True if you want headless mode
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-blink-features=AutomationControlled")
+    return create_uc_driver(profile)
+
+def create_http_session(pool_size=10):
+    """
+    Create a requests session with a keep-alive connection pool.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+def parse_job_html(page_html):
+    """
+    Parse the job data (Job Name, Location, Salary, Qualifications) out of raw job page HTML.
+    """
+    tree = lxml_html.fromstring(page_html)
+
+    def text_by_testid(testid):
+        nodes = tree.xpath(f'//*[@data-testid="{testid}"]')
+        text = nodes[0].text_content().strip() if nodes else ""
+        metrics.selector(SCRAPER, testid, bool(text), mode="http")
+        return text if text else "N/A"
+
+    job_data = {
+        "Job Name": text_by_testid("viewJobTitle"),
+        "Salary": text_by_testid("viewJobBodyJobCompensation"),
+        "Location": text_by_testid("viewJobCompanyLocation"),
+    }
+
+    # Qualifications are the list items inside the qualifications container
+    qualifications = []
+    containers = tree.xpath('//*[@data-testid="viewJobQualificationsContainer"]')
+    if containers:
+        items = containers[0].xpath('.//*[contains(concat(" ", normalize-space(@class), " "), " chakra-wrap__listitem ")]')
+        qualifications = [item.text_content().strip() for item in items if item.text_content().strip()]
+    metrics.selector(SCRAPER, "viewJobQualificationsContainer", bool(qualifications), mode="http")
+    job_data["Qualifications"] = "; ".join(qualifications) if qualifications else "N/A"
+
+    return job_data
+
+def fetch_job_data_http(session, job_link, timeout=10):
+    """
+    Fetch the raw job page over HTTP and parse it without a browser.
+    Returns None if the request fails.
+    """
+    try:
+        with metrics.timer('page_load_seconds', scraper=SCRAPER, mode="http"):
+            response = session.get(job_link, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        metrics.inc('http_errors_total', scraper=SCRAPER)
+        print(f"HTTP fetch failed for {job_link}: {e}")
+        return None
+    return parse_job_html(response.content)
+
+def has_required_fields(job_data):
+    """
+    Check that every field in REQUIRED_FIELDS was found.
+    """
+    return all(job_data.get(field, "N/A") != "N/A" for field in REQUIRED_FIELDS)
+
+def fetch_complete_job_data_http(session, job_link):
+    """
+    Fetch the job data over HTTP, returning None when the browser is needed
+    because the required fields are missing from the raw HTML.
+    This is the HTTP-first step of extract_job_data_from_pool.
+    """
+    job_data = fetch_job_data_http(session, job_link)
+    if job_data and has_required_fields(job_data):
+        return job_data
+    metrics.inc('browser_fallbacks_total', scraper=SCRAPER)
+    print(f"Falling back to browser for {job_link}")
+    return None
+
+def extract_job_data_from_pool(pool, job_link, session=None):
+    """
+    Extract the job data for a job link.
+    If an HTTP session is given, the raw HTML is tried first and a browser session is only
+    leased from `pool` when the required fields are missing from it.
+    """
+    if session is not None:
+        job_data = fetch_complete_job_data_http(session, job_link)
+        if job_data:
+            return job_data
 
-    driver = uc.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    return driver
+    with pool.session() as driver:
+        job_data = extract_job_data_browser(driver, job_link)
+        pool.record_page_weight(driver)
+    return job_data
 
-def extract_job_data(driver, job_link):
+def extract_job_data_browser(driver, job_link):
     """
     Navigate to the job link and extract the job data (Job Name, Location, Salary, Qualifications).
     """
-    driver.get(job_link)
-    time.sleep(3)  # Wait for the page to load
+    with metrics.timer('page_load_seconds', scraper=SCRAPER, mode="browser"):
+        driver.get(job_link)
+        wait_for_element(driver, '[data-testid="viewJobTitle"]')  # Wait for the page to load
 
     job_data = {}
 
@@ -33,21 +150,27 @@ def extract_job_data(driver, job_link):
         # Extract Job Name (Title)
         job_name = driver.find_element(By.CSS_SELECTOR, '[data-testid="viewJobTitle"]').text.strip()
         job_data["Job Name"] = job_name
+        metrics.selector(SCRAPER, "viewJobTitle", True, mode="browser")
     except NoSuchElementException:
+        metrics.selector(SCRAPER, "viewJobTitle", False, mode="browser")
         job_data["Job Name"] = "N/A"
 
     try:
         # Extract Salary
         salary = driver.find_element(By.CSS_SELECTOR, '[data-testid="viewJobBodyJobCompensation"]').text.strip()
         job_data["Salary"] = salary
+        metrics.selector(SCRAPER, "viewJobBodyJobCompensation", True, mode="browser")
     except NoSuchElementException:
+        metrics.selector(SCRAPER, "viewJobBodyJobCompensation", False, mode="browser")
         job_data["Salary"] = "N/A"
 
     try:
         # Extract Location
         location = driver.find_element(By.CSS_SELECTOR, '[data-testid="viewJobCompanyLocation"]').text.strip()
         job_data["Location"] = location
+        metrics.selector(SCRAPER, "viewJobCompanyLocation", True, mode="browser")
     except NoSuchElementException:
+        metrics.selector(SCRAPER, "viewJobCompanyLocation", False, mode="browser")
         job_data["Location"] = "N/A"
 
     try:
@@ -58,7 +181,9 @@ def extract_job_data(driver, job_link):
         
         # Ensure qualifications are always saved as a single string joined by semicolons
         job_data["Qualifications"] = "; ".join(qualifications) if qualifications else "N/A"
+        metrics.selector(SCRAPER, "viewJobQualificationsContainer", bool(qualifications), mode="browser")
     except NoSuchElementException:
+        metrics.selector(SCRAPER, "viewJobQualificationsContainer", False, mode="browser")
         job_data["Qualifications"] = "N/A"
 
     return job_data
@@ -74,65 +199,213 @@ def read_job_links_from_csv(file_path):
             job_links.append(row[0])  # Assuming the links are in the first column
     return job_links
 
-def save_job_data_to_csv(job_data, output_file):
+def read_job_tasks(job_files):
     """
-    Save the extracted job data into a CSV file.
+    Reads (job_link, job_title) pairs from all job link files.
     """
-    with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-        fieldnames = ["Job Name", "Location", "Salary", "Qualifications"]
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Ensure qualifications are correctly joined into a single string before saving
-        for job in job_data:
-            # In case the qualifications field contains a tuple or list, convert it to a string
-            if isinstance(job["Qualifications"], list):
-                job["Qualifications"] = "; ".join(job["Qualifications"])  # Join qualifications with semicolons
-            
-        writer.writerows(job_data)
-    print(f"✅ Saved {len(job_data)} job entries to '{output_file}'.")
-
-def main():
-    # Define the job files and their corresponding job titles
-    job_files = [
-        ("ai_ml_unprocessed_links.csv", "AI/ML"),
-        ("data_scientist_unprocessed_links.csv", "Data Scientist"),
-        ("software_engineer_unprocessed_links.csv", "Software Engineering")
-    ]
-    
-    # Initialize WebDriver
-    driver = initialize_driver()
-
-    # Store job data here
-    all_job_data = []
+    tasks = []
+    for job_file, job_title in job_files:
+        print(f"Reading job links from {job_file}...")
+        tasks.extend((link, job_title) for link in read_job_links_from_csv(job_file))
+    return tasks
 
+def extract_with_controller(controller, pool, link, session=None):
+    """
+    Extract one job under the rate controller's budget.
+    A page without the required fields counts as an error so the controller backs off.
+    """
+    controller.acquire()
+    start = time.monotonic()
     try:
-        # Loop through job files and scrape data
-        for job_file, job_title in job_files:
-            print(f"Reading job links from {job_file}...")
-            job_links = read_job_links_from_csv(job_file)
-            
-            # Loop through each job link and scrape the data
-            for link in job_links:
-                print(f"Extracting data for job link: {link}")
-                job_data = extract_job_data(driver, link)
+        job_data = extract_job_data_from_pool(pool, link, session=session)
+    except Exception:
+        controller.record(time.monotonic() - start, ok=False)
+        raise
+    controller.record(time.monotonic() - start, ok=has_required_fields(job_data))
+    return job_data
+
+def scrape_links_concurrently(tasks, num_workers=4, controller=None, driver_factory=initialize_driver, use_http=False,
+                              pool=None):
+    """
+    Scrapes (job_link, job_title) tasks with `num_workers` workers pulling from one shared queue.
+    Workers lease browser sessions from `pool` (a new pool of `num_workers` sessions if not given)
+    and share `controller`, the global request budget.
+    With `use_http`, pages are fetched over HTTP first and a browser is only leased on fallback.
+    Yields (job_link, job_data) pairs as soon as each job is extracted.
+    """
+    link_queue = queue.Queue()
+    for task in tasks:
+        link_queue.put(task)
+
+    results = queue.Queue()
+    controller = controller or RateController(name=SCRAPER)
+    own_pool = pool is None
+    pool = pool or SessionPool(driver_factory, size=num_workers)
+    worker_done = object()  # Sentinel put on the results queue when a worker exits
+
+    def worker(worker_id):
+        session = create_http_session() if use_http else None
+        try:
+            while True:
+                try:
+                    link, job_title = link_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                print(f"[worker {worker_id}] Extracting data for job link: {link}")
+                try:
+                    job_data = extract_with_controller(controller, pool, link, session=session)
+                except Exception as e:
+                    print(f"[worker {worker_id}] Error extracting {link}: {e}")
+                    continue
                 job_data["Job Name"] = job_title  # Set the job title dynamically based on the file
-                all_job_data.append(job_data)
-                time.sleep(2)  # Add delay between scraping each job
+                results.put((link, job_data))
+        except Exception as e:
+            print(f"[worker {worker_id}] Worker stopped: {e}")
+        finally:
+            if session:
+                session.close()
+            results.put(worker_done)
 
-        # Save the extracted job data to a new CSV file
-        if all_job_data:
-            output_file = "processed_job_data.csv"  # Change the output file name here
-            save_job_data_to_csv(all_job_data, output_file)
-        else:
-            print("⚠ No job data extracted.")
+    num_workers = max(1, min(num_workers, len(tasks)))
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(num_workers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        running = len(threads)
+        while running:
+            item = results.get()
+            if item is worker_done:
+                running -= 1
+            else:
+                yield item
 
+        for thread in threads:
+            thread.join()
     finally:
-        if driver:
+        if own_pool:
+            pool.close()
+
+def scrape_links_sequentially(tasks, controller=None, driver_factory=initialize_driver, use_http=False, pool=None):
+    """
+    Scrapes (job_link, job_title) tasks one at a time through a single browser session.
+    A link that fails is logged and skipped, like in scrape_links_concurrently.
+    Yields (job_link, job_data) pairs.
+    """
+    controller = controller or RateController(name=SCRAPER)
+    own_pool = pool is None
+    pool = pool or SessionPool(driver_factory, size=1)
+    session = create_http_session(pool_size=1) if use_http else None
+    try:
+        for link, job_title in tasks:
+            print(f"Extracting data for job link: {link}")
             try:
-                driver.quit()
+                job_data = extract_with_controller(controller, pool, link, session=session)
             except Exception as e:
-                print(f"Error while quitting driver: {e}")
+                print(f"Error extracting {link}: {e}")
+                continue
+            job_data["Job Name"] = job_title  # Set the job title dynamically based on the file
+            yield link, job_data
+    finally:
+        if own_pool:
+            pool.close()
+        if session:
+            session.close()
+
+def main(job_files=JOB_FILES, output_file=OUTPUT_FILE, num_workers=1, min_interval=1.0, use_http=False,
+         store_path=jobstore.STORE_FILE, batch_size=25, retry_missing=False, export_only=False,
+         recycle_after=200, profile="full"):
+    if min_interval <= 0:
+        raise ValueError(f"min_interval must be greater than 0, got {min_interval}")
+    conn = jobstore.open_job_store(store_path)
+    try:
+        if export_only:
+            jobstore.export_jobs(conn, output_file)
+            return
+
+        # Skip links that were already fetched in a previous run (and duplicates across files).
+        # URLs are compared (and stored) in canonical form, so a posting found by several searches is
+        # fetched once; the link itself is fetched as given.
+        fetched_urls = {dedup.canonical_url(url) for url in jobstore.get_fetched_urls(conn, retry_missing=retry_missing)}
+        tasks = []
+        duplicates = 0
+        for link, job_title in read_job_tasks(job_files):
+            key = dedup.canonical_url(link)
+            if key not in fetched_urls:
+                fetched_urls.add(key)
+                tasks.append((link, job_title))
+            else:
+                duplicates += 1
+        metrics.dropped(SCRAPER, "seen_url", duplicates)
+        print(f"{len(tasks)} new job links to scrape ({duplicates} already seen), "
+              f"{jobstore.count_jobs(conn)} already in '{store_path}'.")
+
+        # The politeness limit caps the request rate; the controller backs off below it when the site struggles
+        controller = RateController(rate=1.0 / min_interval, max_rate=1.0 / min_interval, name=SCRAPER)
+        pool = SessionPool(partial(initialize_driver, profile), size=max(1, num_workers), max_pages=recycle_after)
+        if tasks and not use_http:
+            pool.warm_up()  # In HTTP mode browsers are only started on fallback
+        if num_workers > 1:
+            print(f"Scraping {len(tasks)} job links with {num_workers} workers...")
+            results = scrape_links_concurrently(tasks, num_workers=num_workers, controller=controller,
+                                                use_http=use_http, pool=pool)
+        else:
+            results = scrape_links_sequentially(tasks, controller=controller, use_http=use_http, pool=pool)
+
+        # Commit results in batches so a crash only loses the current batch
+        batch = []
+        try:
+            for link, job_data in results:
+                batch.append((dedup.canonical_url(link), job_data))
+                metrics.rows(SCRAPER)
+                if len(batch) >= batch_size:
+                    jobstore.save_jobs(conn, batch)
+                    batch = []
+        finally:
+            if batch:
+                jobstore.save_jobs(conn, batch)
+            pool.close()
+            controller.print_report("Job detail scraping")
+            pool.print_metrics()
+
+        # Save the extracted job data to a new CSV file
+        if jobstore.count_jobs(conn):
+            jobstore.export_jobs(conn, output_file)
+        else:
+            print("⚠ No job data extracted.")
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape SimplyHired job detail pages.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser sessions")
+    parser.add_argument("--min-interval", type=float, default=1.0,
+                        help="Minimum seconds between page loads across all workers")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Output file: .csv, .parquet or .arrow")
+    parser.add_argument("--http", action="store_true",
+                        help="Fetch raw HTML first and only use the browser when required fields are missing")
+    parser.add_argument("--store", default=jobstore.STORE_FILE, help="SQLite job store used to resume runs")
+    parser.add_argument("--batch-size", type=int, default=25, help="Number of jobs committed to the store at once")
+    parser.add_argument("--retry-missing", action="store_true",
+                        help="Fetch again the links whose page previously yielded no data")
+    parser.add_argument("--export-only", action="store_true",
+                        help="Only export the job store to the output file, without scraping")
+    parser.add_argument("--recycle-after", type=int, default=200,
+                        help="Restart a browser session after this many pages")
+    parser.add_argument("--profile", choices=PROFILES, default="full",
+                        help="Browser profile; 'lean' is headless and blocks images, fonts, CSS and trackers")
+    parser.add_argument("--metrics", default=None,
+                        help="Write run metrics to this file (.prom for Prometheus text, otherwise JSON lines)")
+    args = parser.parse_args()
+    if args.min_interval <= 0:
+        parser.error("--min-interval must be greater than 0")
+    try:
+        with metrics.stage(SCRAPER):
+            main(output_file=args.output, num_workers=args.workers, min_interval=args.min_interval,
+                 use_http=args.http, store_path=args.store, batch_size=args.batch_size,
+                 retry_missing=args.retry_missing, export_only=args.export_only,
+                 recycle_after=args.recycle_after, profile=args.profile)
+    finally:
+        if args.metrics:
+            metrics.export(args.metrics)
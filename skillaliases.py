@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+import re
+import time
+import argparse
+import difflib
+from collections import defaultdict
+from functools import lru_cache
+
+# Canonical skill names, their aliases and the fragments to drop
+ALIASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_aliases.json')
+
+WHITESPACE = re.compile(r'\s+')
+DIGITS = re.compile(r'\d+')
+
+def load_aliases(path=ALIASES_FILE):
+    """Load the alias table (canonical skill -> aliases) and the drop rules from the aliases file."""
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+def normalize_token(token):
+    """Lowercase a raw skill token and collapse runs of whitespace."""
+    return WHITESPACE.sub(' ', token).strip().lower()
+
+class SkillCanonicalizer:
+    """
+    Maps raw skill tokens to canonical skills: exact aliases first, then fuzzy matching of
+    unseen tokens against the configured canonical names and aliases. Tokens learned at runtime
+    are never fuzzy-match targets, so the result doesn't depend on input order and each lookup
+    costs the same however many skills were seen. Every distinct raw token is resolved only
+    once; later lookups are a dict hit.
+    """
+    def __init__(self, config, fuzzy_cutoff=0.94, min_fuzzy_length=5, min_length_ratio=0.9):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.min_fuzzy_length = min_fuzzy_length
+        self.min_length_ratio = min_length_ratio
+        self.drop = frozenset(normalize_token(token) for token in config.get('drop', []))
+        self.drop_prefixes = tuple(config.get('drop_prefixes', []))
+
+        self.alias_index = {}
+        for canonical, aliases in config['aliases'].items():
+            canonical = normalize_token(canonical)
+            self.alias_index[canonical] = canonical
+            for alias in aliases:
+                self.alias_index[normalize_token(alias)] = canonical
+
+        # Configured names for fuzzy matching, bucketed by first character to keep each lookup small
+        self._candidates = defaultdict(list)
+        for name in self.alias_index:
+            self._candidates[name[0]].append(name)
+        self._resolved = {}  # raw token -> canonical skill (None if dropped)
+        self.fuzzy_matches = 0
+
+    def _fuzzy_match(self, token):
+        if len(token) < self.min_fuzzy_length:
+            return None
+        matches = difflib.get_close_matches(token, self._candidates[token[0]], n=1, cutoff=self.fuzzy_cutoff)
+        if not matches:
+            return None
+        # A spelling variant has (nearly) the same length and the same numbers: "python 2" is not "python 3"
+        match = matches[0]
+        if min(len(token), len(match)) / max(len(token), len(match)) < self.min_length_ratio:
+            return None
+        return match if DIGITS.findall(token) == DIGITS.findall(match) else None
+
+    def canonical(self, token):
+        """Returns the canonical skill for a raw token, or None if the token should be dropped."""
+        if token in self._resolved:
+            return self._resolved[token]
+
+        key = normalize_token(token)
+        if not key or key in self.drop or key.startswith(self.drop_prefixes):
+            canonical = None
+        elif key in self.alias_index:
+            canonical = self.alias_index[key]
+        else:
+            match = self._fuzzy_match(key)
+            if match:
+                self.fuzzy_matches += 1
+                canonical = self.alias_index[match]
+            else:
+                canonical = key
+            self.alias_index[key] = canonical  # Other raw spellings of the same key become a dict hit
+
+        self._resolved[token] = canonical
+        return canonical
+
+    def canonicalize(self, skills):
+        """Canonicalize a list of skills (or a semicolon-separated string), dropping empty and duplicate skills."""
+        if isinstance(skills, str):
+            skills = skills.split(';')
+        canonical = (self.canonical(skill) for skill in skills)
+        return [skill for skill in dict.fromkeys(canonical) if skill]
+
+@lru_cache(maxsize=None)
+def get_canonicalizer(path=ALIASES_FILE):
+    """Returns the SkillCanonicalizer for an aliases file, building it only once per process."""
+    return SkillCanonicalizer(load_aliases(path))
+
+def feature_reduction(raw_skills, canonical_skills):
+    """Returns the number of distinct skills (features) before and after canonicalization."""
+    raw = {skill for skills in raw_skills for skill in skills if skill}
+    canonical = {skill for skills in canonical_skills for skill in skills}
+    return {"raw_features": len(raw), "canonical_features": len(canonical),
+            "removed": len(raw) - len(canonical)}
+
+def print_feature_reduction(raw_skills, canonical_skills):
+    return print_reduction_report(feature_reduction(raw_skills, canonical_skills))
+
+def print_reduction_report(report):
+    print(f"Skill features: {report['raw_features']} raw -> {report['canonical_features']} canonical "
+          f"({report['removed']} removed)")
+    return report
+
+def benchmark(file_path, n_estimators=100):
+    """Compare RandomForest training time on raw versus canonical skill features of a CSV."""
+    import pandas as pd
+    from sklearn.preprocessing import MultiLabelBinarizer
+    from sklearn.ensemble import RandomForestRegressor
+
+    with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+        rows = [row for row in csv.DictReader(file) if row.get('Skills') and row.get('Salary')]
+    raw_skills = [[skill.strip() for skill in row['Skills'].split(';') if skill.strip()] for row in rows]
+    salaries = pd.to_numeric(pd.Series([row['Salary'] for row in rows]), errors='coerce')
+    keep = salaries.notna().to_numpy()
+    raw_skills = [skills for skills, ok in zip(raw_skills, keep) if ok]
+    salaries = salaries[keep]
+
+    canonicalizer = get_canonicalizer()
+    start = time.perf_counter()
+    canonical_skills = [canonicalizer.canonicalize(skills) for skills in raw_skills]
+    canonicalize_seconds = time.perf_counter() - start
+    report = print_feature_reduction(raw_skills, canonical_skills)
+    print(f"Canonicalized {len(raw_skills)} rows in {canonicalize_seconds:.3f}s "
+          f"({canonicalizer.fuzzy_matches} fuzzy matches)")
+
+    results = {}
+    for name, skills in [("raw", raw_skills), ("canonical", canonical_skills)]:
+        X = MultiLabelBinarizer().fit_transform(skills)
+        start = time.perf_counter()
+        RandomForestRegressor(n_estimators=n_estimators, random_state=42).fit(X, salaries)
+        results[name] = time.perf_counter() - start
+        print(f"{name}: {X.shape[1]} features, trained in {results[name]:.2f}s")
+    print(f"Training speedup: {results['raw'] / results['canonical']:.2f}x")
+    report.update(results)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the feature reduction and training speedup of skill canonicalization.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="CSV file with Skills and Salary columns")
+    parser.add_argument("--trees", type=int, default=100, help="Number of trees in the benchmark forest")
+    args = parser.parse_args()
+    benchmark(args.file, args.trees)
@@ -0,0 +1,115 @@
+import time
+import argparse
+from collections import Counter, defaultdict
+import numpy as np
+import pandas as pd
+
+class SkillCube:
+    """
+    Skill frequency index: counts per (title, skill), (location, skill), ... built once with a
+    vectorized explode/groupby. Each title or location keeps its skills ranked by count, so a
+    top-k query is a slice of the first k entries. Appended rows are applied as count deltas;
+    only the titles and locations they touch are re-ranked, on their next query.
+    """
+    def __init__(self, dimensions=('Title', 'Location')):
+        self.dimensions = tuple(dimensions)
+        self.counts = {dimension: defaultdict(Counter) for dimension in self.dimensions}
+        self.rows = 0
+        self._ranked = {}  # (dimension, value) -> [(skill, count), ...] sorted by count
+        self._stale = set()  # (dimension, value) pairs whose ranking needs rebuilding
+
+    @classmethod
+    def from_frame(cls, df, dimensions=('Title', 'Location')):
+        """Build the cube from a DataFrame whose Skills column holds lists of skills."""
+        cube = cls(dimensions)
+        cube.add_rows(df)
+        return cube
+
+    @classmethod
+    def from_compact(cls, dataset, dimensions=('Title', 'Location')):
+        """
+        Build the cube from a CompactDataset by counting (category code, skill ID) pairs with bincount,
+        without materializing any per-row skill lists.
+        """
+        cube = cls(dimensions)
+        lengths = dataset.skill_lengths()
+        skills = dataset.vocab.skills
+        for dimension in cube.dimensions:
+            column = getattr(dataset, dimension.lower())
+            row_codes = np.repeat(column.codes.astype(np.int64), lengths)
+            valid = row_codes >= 0
+            pair_counts = np.bincount(row_codes[valid] * len(skills) + dataset.skill_codes[valid],
+                                      minlength=len(column.categories) * len(skills))
+            pairs = np.flatnonzero(pair_counts)
+            categories = column.categories
+            cube._apply_counts(dimension, (((categories[pair // len(skills)], skills[pair % len(skills)]),
+                                            pair_counts[pair]) for pair in pairs))
+        cube.rows = len(dataset)
+        return cube
+
+    def add_rows(self, df, sign=1):
+        """
+        Apply the skill counts of `df` as a delta (use sign=-1 to remove rows again).
+        Skills may be lists or semicolon-separated strings.
+        """
+        skills = df['Skills']
+        if len(skills) and isinstance(skills.iloc[0], str):
+            skills = skills.str.split(';').apply(lambda parts: [part.strip() for part in parts if part.strip()])
+
+        for dimension in self.dimensions:
+            exploded = pd.DataFrame({dimension: df[dimension].to_numpy(), 'Skill': skills.to_numpy()})
+            exploded = exploded.explode('Skill').dropna()
+            pair_counts = exploded.groupby([dimension, 'Skill'], sort=False, observed=True).size()
+            self._apply_counts(dimension, pair_counts.items(), sign)
+        self.rows += sign * len(df)
+
+    def _apply_counts(self, dimension, pair_counts, sign=1):
+        """Add ((value, skill), count) deltas to a dimension and mark the touched values for re-ranking."""
+        counts = self.counts[dimension]
+        for (value, skill), count in pair_counts:
+            counter = counts[value]
+            counter[skill] += sign * int(count)
+            if counter[skill] <= 0:
+                del counter[skill]
+                if not counter:
+                    del counts[value]
+            self._stale.add((dimension, value))
+
+    def _ranking(self, dimension, value):
+        key = (dimension, value)
+        if key in self._stale or key not in self._ranked:
+            counter = self.counts[dimension].get(value, Counter())
+            self._ranked[key] = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+            self._stale.discard(key)
+        return self._ranked[key]
+
+    def top_k(self, value, k=5, dimension='Title'):
+        """Returns the `k` most frequent skills for one title (or location) as [(skill, count), ...]."""
+        return self._ranking(dimension, value)[:k]
+
+    def top_k_by(self, k=5, dimension='Title'):
+        """Returns {value: Series of its `k` most frequent skills} for every title (or location)."""
+        return {value: pd.Series(dict(self.top_k(value, k, dimension)), name='count')
+                for value in self.counts[dimension]}
+
+    def values(self, dimension='Title'):
+        return list(self.counts[dimension])
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the title x skill count cube and print the top skills.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="CSV file with Title, Location and Skills")
+    parser.add_argument("--by", default='Title', choices=['Title', 'Location'], help="Dimension to rank skills by")
+    parser.add_argument("-k", type=int, default=5, help="Number of skills per title or location")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.file).dropna(subset=['Skills'])
+    start = time.perf_counter()
+    cube = SkillCube.from_frame(df)
+    print(f"Built skill cube over {cube.rows} rows in {time.perf_counter() - start:.3f}s")
+
+    for value in sorted(cube.values(args.by), key=str):
+        skills = ', '.join(f"{skill} ({count})" for skill, count in cube.top_k(value, args.k, args.by))
+        print(f"{value}: {skills}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Real files the synthetic data is sampled from, and the columns holding semicolon-separated skills
+SOURCE_FILES = {
+    'processed_job_data.csv': 'Qualifications',
+    'flexjobs_jobs.csv': None,
+    'data.csv': 'Skills',
+    'filtered_data.csv': 'Skills',
+}
+
+# Named sizes accepted on the command line
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+def parse_size(size):
+    """'10k', '1m', '10m' or a plain number of rows."""
+    return SIZES.get(size.lower()) or int(size)
+
+def synthesize(source, rows, skills_column=None, novel_rate=0.01, chunk_size=1_000_000, seed=42):
+    """
+    Yield DataFrames with `rows` rows in total, resampled (with replacement) from the rows of `source`,
+    so the joint distribution of titles, locations, salaries and skills matches the real data.
+    A `novel_rate` fraction of rows gets one extra never-seen skill, so per-skill caches also see misses.
+    """
+    real = pd.read_csv(source, dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(seed)
+    novel_id = 0
+    for start in range(0, rows, chunk_size):
+        count = min(chunk_size, rows - start)
+        chunk = real.iloc[rng.integers(0, len(real), count)].reset_index(drop=True)
+        if skills_column and novel_rate:
+            novel = np.flatnonzero(rng.random(count) < novel_rate)
+            names = pd.Series([f"; synthetic skill {novel_id + i}" for i in range(len(novel))], index=novel)
+            chunk.loc[novel, skills_column] = chunk.loc[novel, skills_column] + names
+            novel_id += len(novel)
+        yield chunk
+
+def generate(rows, output_dir, source_dir='.', novel_rate=0.01, seed=42):
+    """Write `rows`-row synthetic copies of every source file into `output_dir`. Returns the written paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, skills_column in SOURCE_FILES.items():
+        source = os.path.join(source_dir, name)
+        if not os.path.exists(source):
+            print(f"⚠ {source} not found, skipping")
+            continue
+        path = os.path.join(output_dir, name)
+        start = time.perf_counter()
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            for i, chunk in enumerate(synthesize(source, rows, skills_column, novel_rate, seed=seed)):
+                chunk.to_csv(file, index=False, header=i == 0, lineterminator='\r\n')
+        print(f"✅ Wrote {rows} rows to '{path}' in {time.perf_counter() - start:.1f}s")
+        paths[name] = path
+    return paths
+
+def dataset_dir(size, base_dir='bench_data'):
+    return os.path.join(base_dir, size.lower())
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic job-posting data at benchmark scale.")
+    parser.add_argument("sizes", nargs="*", default=['10k'], help="Sizes to generate: 10k, 100k, 1m, 10m or a row count")
+    parser.add_argument("--output-dir", default='bench_data', help="Each size is written to <output-dir>/<size>/")
+    parser.add_argument("--novel-rate", type=float, default=0.01, help="Fraction of rows with an extra unseen skill")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        generate(parse_size(size), dataset_dir(size, args.output_dir), novel_rate=args.novel_rate, seed=args.seed)
+
+if __name__ == "__main__":
+    main()
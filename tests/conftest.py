@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves the fixture files without logging every request, recording (time, path) of each one instead."""
+    def do_GET(self):
+        self.server.served.append((time.monotonic(), self.path))
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def http_server():
+    """A local HTTP server serving tests/fixtures; `served` lists the (time, path) of every request."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=FIXTURES_DIR))
+    server.served = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@pytest.fixture
+def fixture_server(http_server):
+    """Base URL (http://127.0.0.1:<port>) of the fixture server."""
+    return f"http://127.0.0.1:{http_server.server_address[1]}"
@@ -0,0 +1,64 @@
+from selenium.common.exceptions import NoSuchElementException
+import linkscraper
+from sessionpool import SessionPool
+from throttle import RateController
+
+PAGES = 5
+
+class FakeElement:
+    def __init__(self, href):
+        self.href = href
+
+    def get_attribute(self, name):
+        return self.href
+
+class FakeDriver:
+    """Serves PAGES result pages of two job links each, linked by 'Next page'."""
+    def __init__(self):
+        self.page = None
+        self.loads = 0
+
+    def get(self, url):
+        self.page = int(url.rsplit('=', 1)[1])
+        self.loads += 1
+
+    def find_elements(self, by, selector):
+        return [FakeElement(f"https://example.com/job/{self.page}-{i}") for i in range(2)]
+
+    def find_element(self, by, selector):
+        if 'Next page' not in selector:
+            return FakeElement(None)
+        if self.page >= PAGES:
+            raise NoSuchElementException()
+        return FakeElement(f"https://example.com/search?page={self.page + 1}")
+
+    def execute_script(self, script):
+        return 0
+
+    def quit(self):
+        pass
+
+def test_pagination_walk_counts_every_page_against_the_recycle_limit():
+    drivers = []
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+    pool = SessionPool(factory, size=1, max_pages=2)
+    controller = RateController(rate=1000, max_rate=1000, name="test")
+
+    links = linkscraper.scrape_all_pages(None, "https://example.com/search?page=1", max_pages=10,
+                                         controller=controller, pool=pool)
+
+    assert len(links) == 2 * PAGES
+    assert [driver.loads for driver in drivers] == [2, 2, 1]
+    assert pool.leases == PAGES and pool.recycled == 2
+
+def test_max_pages_stops_without_loading_another_page():
+    driver = FakeDriver()
+    controller = RateController(rate=1000, max_rate=1000, name="test")
+
+    links = linkscraper.scrape_all_pages(driver, "https://example.com/search?page=1", max_pages=3,
+                                         controller=controller)
+
+    assert len(links) == 6
+    assert driver.loads == 3
@@ -0,0 +1,20 @@
+import pytest
+import locations
+
+@pytest.mark.parametrize("location, expected", [
+    ("Austin, Texas Metropolitan Area", ("TX", "AUS")),
+    ("austin, texas metropolitan area", ("TX", "AUS")),
+    ("San Francisco Bay Area", ("CA", "SF")),
+    ("Seattle, Greater Seattle Area", ("WA", "SEA")),
+    ("Palo Alto, CA", ("CA", "SF")),
+    ("Austin, TX", ("TX", "AUS")),
+    ("Columbus, Ohio", ("OH", None)),
+    ("Remote in New York, NY", ("Remote", None)),
+    ("", ("Remote", None)),
+])
+def test_resolve_location(location, expected):
+    assert locations.resolve_location(location) == expected
+
+def test_every_metro_alias_resolves():
+    for alias, expected in locations.METRO_ALIASES.items():
+        assert locations.resolve_location(alias.title()) == expected, alias
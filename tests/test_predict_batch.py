@@ -0,0 +1,32 @@
+import json
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from features import SkillVocabulary, build_skill_matrix
+import predict_batch
+
+def train_model():
+    vocab = SkillVocabulary(["python", "sql", "java"])
+    X = build_skill_matrix([["python"], ["sql"], ["python", "sql"], ["java"]], vocab, grow=False)
+    return LinearRegression().fit(X, [100_000, 90_000, 130_000, 80_000]), vocab
+
+def test_list_skills_predict_like_text_skills(tmp_path):
+    model, vocab = train_model()
+    rows = [{"Title": "Data Scientist", "Skills": ["Python", "SQL"]},
+            {"Title": "Data Scientist", "Skills": "Python; SQL"}]
+    input_file = tmp_path / "rows.jsonl"
+    input_file.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+    chunk = next(predict_batch.read_chunks(str(input_file), 10))
+    result = predict_batch.predict_chunk(chunk, model, vocab)
+    assert list(result["Skills"]) == ["Python; SQL", "Python; SQL"]
+    assert result["Predicted Salary"][0] == result["Predicted Salary"][1]
+    assert result["Predicted Salary"][0] == round(model.predict(build_skill_matrix([["python", "sql"]], vocab))[0], 2)
+
+def test_json_array_input(tmp_path):
+    model, vocab = train_model()
+    input_file = tmp_path / "rows.json"
+    input_file.write_text(json.dumps([{"title": "AI/ML", "skills": ["Java"]}] * 3), encoding="utf-8")
+    chunks = list(predict_batch.read_chunks(str(input_file), 2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    result = pd.concat([predict_batch.predict_chunk(chunk, model, vocab) for chunk in chunks])
+    assert list(result["Skills"]) == ["Java"] * 3
@@ -0,0 +1,102 @@
+import csv
+import os
+import metrics
+import simplyjobs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as file:
+        return file.read()
+
+def test_parse_job_html():
+    job_data = simplyjobs.parse_job_html(read_fixture("job/abc123.html"))
+    assert job_data == {
+        "Job Name": "Machine Learning Engineer",
+        "Salary": "$150,000 - $190,000 a year",
+        "Location": "San Francisco, CA",
+        "Qualifications": "Python; PyTorch; 5 years",
+    }
+
+def test_parse_job_html_missing_fields():
+    job_data = simplyjobs.parse_job_html(read_fixture("job/def456.html"))
+    assert job_data["Salary"] == "N/A"
+    assert simplyjobs.has_required_fields(job_data)
+
+def test_title_alone_is_not_enough():
+    # The title is rendered server-side even when the rest of the page needs JavaScript
+    job_data = simplyjobs.parse_job_html(b'<html><body><h1 data-testid="viewJobTitle">Engineer</h1></body></html>')
+    assert job_data["Job Name"] == "Engineer"
+    assert not simplyjobs.has_required_fields(job_data)
+
+def test_fetch_complete_job_data_http(fixture_server):
+    session = simplyjobs.create_http_session(pool_size=1)
+    try:
+        job_data = simplyjobs.fetch_complete_job_data_http(session, f"{fixture_server}/job/abc123.html")
+        assert job_data["Location"] == "San Francisco, CA"
+        # A failed request returns None, so the caller falls back to the browser
+        assert simplyjobs.fetch_complete_job_data_http(session, f"{fixture_server}/job/missing.html") is None
+    finally:
+        session.close()
+
+def test_main_http_end_to_end(fixture_server, tmp_path):
+    links_file = tmp_path / "links.csv"
+    links_file.write_text(
+        f"{fixture_server}/job/abc123.html?utm_source=search\n"
+        f"{fixture_server}/job/abc123.html\n"  # Same posting without the tracking parameter
+        f"{fixture_server}/job/def456.html\n",
+        encoding="utf-8",
+    )
+    output_file = tmp_path / "processed_job_data.csv"
+    store = tmp_path / "job_store.db"
+
+    simplyjobs.main(job_files=[(str(links_file), "AI/ML")], output_file=str(output_file), min_interval=0.01,
+                    use_http=True, store_path=str(store))
+
+    with open(output_file, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert rows == [
+        {"Job Name": "AI/ML", "Location": "San Francisco, CA", "Salary": "$150,000 - $190,000 a year",
+         "Qualifications": "Python; PyTorch; 5 years"},
+        {"Job Name": "AI/ML", "Location": "Remote", "Salary": "N/A", "Qualifications": "SQL"},
+    ]
+
+    # A second run finds every link in the job store and fetches nothing
+    simplyjobs.main(job_files=[(str(links_file), "AI/ML")], output_file=str(output_file), min_interval=0.01,
+                    use_http=True, store_path=str(store))
+    with open(output_file, newline="", encoding="utf-8") as file:
+        assert len(list(csv.DictReader(file))) == 2
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+def test_main_http_workers_match_sequential(fixture_server, http_server, tmp_path):
+    links_file = tmp_path / "links.csv"
+    links_file.write_text("".join(f"{fixture_server}/job/{page}.html?position={i}\n"
+                                  for i, page in enumerate(["abc123", "def456", "abc123", "def456"])),
+                          encoding="utf-8")
+    job_files = [(str(links_file), "Data Scientist")]
+    min_interval = 0.2
+
+    simplyjobs.main(job_files=job_files, output_file=str(tmp_path / "sequential.csv"), min_interval=min_interval,
+                    use_http=True, store_path=str(tmp_path / "sequential.db"))
+    http_server.served.clear()
+    ok_before = metrics.REGISTRY.value('requests_total', scraper=simplyjobs.SCRAPER, outcome='ok')
+
+    simplyjobs.main(job_files=job_files, output_file=str(tmp_path / "workers.csv"), num_workers=3,
+                    min_interval=min_interval, use_http=True, store_path=str(tmp_path / "workers.db"))
+
+    # Workers finish in any order, so compare the rows as a set
+    key = lambda row: tuple(row.values())
+    sequential = sorted(read_rows(tmp_path / "sequential.csv"), key=key)
+    assert sorted(read_rows(tmp_path / "workers.csv"), key=key) == sequential
+    assert len(sequential) == 2
+
+    # One request per distinct posting, all recorded as successful by the shared controller
+    assert sorted(path for _, path in http_server.served) == ["/job/abc123.html?position=0",
+                                                              "/job/def456.html?position=1"]
+    assert metrics.REGISTRY.value('requests_total', scraper=simplyjobs.SCRAPER, outcome='ok') - ok_before == 2
+    # The workers share one politeness budget: requests start at least min_interval apart
+    times = sorted(served_at for served_at, _ in http_server.served)
+    assert all(later - earlier >= min_interval * 0.9 for earlier, later in zip(times, times[1:]))
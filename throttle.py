@@ -0,0 +1,125 @@
+import time
+import threading
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import metrics
+
+def wait_for_element(driver, css_selector, timeout=10):
+    """
+    Wait until an element matching `css_selector` is present instead of sleeping a fixed time.
+    Returns True if the element appeared before the timeout, False otherwise.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+class RateController:
+    """
+    Token-bucket request budget shared by all workers of a scraper.
+    The rate is cut on errors or slow responses and raised step by step while the site is healthy
+    (additive increase, multiplicative decrease). Tracks time spent waiting versus working, summed
+    over every worker (so with several workers both can exceed the elapsed time),
+    and reports sleep time and request latencies to the shared metrics under `name`.
+    """
+    def __init__(self, rate=1.0, min_rate=0.05, max_rate=1.0, burst=1,
+                 slow_threshold=8.0, backoff_factor=0.5, increase_step=0.05, name="scraper"):
+        self.rate = min(rate, max_rate)  # Requests per second
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.slow_threshold = slow_threshold
+        self.backoff_factor = backoff_factor
+        self.increase_step = increase_step
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._started = time.monotonic()
+
+        self.requests = 0
+        self.errors = 0
+        self.slow_responses = 0
+        self.summed_wait_seconds = 0.0  # Summed over workers, like summed_work_seconds
+        self.summed_work_seconds = 0.0
+
+    def acquire(self):
+        """
+        Take one token from the bucket, sleeping until one is available.
+        """
+        # Reserve the token under the lock, then sleep outside of it so other workers can queue up
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.summed_wait_seconds += delay
+        if delay > 0:
+            metrics.inc('sleep_seconds_total', delay, scraper=self.name)
+            time.sleep(delay)
+
+    def record(self, latency, ok=True):
+        """
+        Record the outcome of one request and adapt the rate.
+        """
+        with self._lock:
+            self.requests += 1
+            self.summed_work_seconds += latency
+            if not ok:
+                self.errors += 1
+                self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+                outcome = "error"
+            elif latency > self.slow_threshold:
+                self.slow_responses += 1
+                self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+                outcome = "slow"
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                outcome = "ok"
+        metrics.observe('request_seconds', latency, scraper=self.name)
+        metrics.inc('requests_total', scraper=self.name, outcome=outcome)
+
+    @contextmanager
+    def request(self):
+        """
+        Acquire a token, then time the body of the with-block as one request.
+        Exceptions raised in the block are recorded as errors and re-raised.
+        """
+        self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(time.monotonic() - start, ok=False)
+            raise
+        self.record(time.monotonic() - start, ok=True)
+
+    def report(self):
+        """
+        Returns a summary of the run: requests, errors and time spent waiting versus working (summed over workers).
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "slow_responses": self.slow_responses,
+                "summed_wait_seconds": round(self.summed_wait_seconds, 2),
+                "summed_work_seconds": round(self.summed_work_seconds, 2),
+                "elapsed_seconds": round(time.monotonic() - self._started, 2),
+                "current_rate": round(self.rate, 3),
+            }
+
+    def print_report(self, label="Run"):
+        report = self.report()
+        print(f"{label}: {report['requests']} requests, {report['errors']} errors, "
+              f"{report['slow_responses']} slow, workers waited {report['summed_wait_seconds']}s "
+              f"and worked {report['summed_work_seconds']}s in total, elapsed {report['elapsed_seconds']}s, "
+              f"final rate {report['current_rate']} req/s")
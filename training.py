@@ -0,0 +1,98 @@
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Default RandomForest hyperparameters for the per-title models
+MODEL_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+def split_cores(tasks, cores=None):
+    """
+    Split the available cores between concurrent tasks.
+    Returns (workers, n_jobs per model) so that workers * n_jobs is about the core count.
+    """
+    cores = cores or os.cpu_count() or 1
+    workers = max(1, min(tasks, cores))
+    return workers, max(1, cores // workers)
+
+def train_title_model(job_title, X, y, feature_names, params=MODEL_PARAMS, n_jobs=1):
+    """
+    Train one RandomForest on a title's rows. The model keeps its own vocabulary: only the skills
+    that occur in those rows, as a tuple in the model's column order.
+    """
+    start = time.perf_counter()
+    columns = np.flatnonzero(X.getnnz(axis=0))
+    model = RandomForestRegressor(**params, n_jobs=n_jobs)
+    model.fit(X[:, columns], y)
+    return {
+        'title': job_title,
+        'model': model,
+        'skills': tuple(feature_names[i] for i in columns),
+        'rows': X.shape[0],
+        'seconds': time.perf_counter() - start,
+    }
+
+def train_title_models(X, y, rows_by_title, feature_names, job_titles, params=MODEL_PARAMS,
+                       use_processes=False, cores=None):
+    """
+    Train one model per job title concurrently from the shared skill matrix `X`.
+    Each task gets its title's row slice; the cores are split between tasks and the trees of each forest.
+    Tree building releases the GIL, so threads already run in parallel and share `X` without copying;
+    `use_processes` runs each title in its own process instead (the calling script must be import-safe).
+    """
+    job_titles = [job for job in job_titles if job in rows_by_title]
+    workers, n_jobs = split_cores(len(job_titles), cores)
+    feature_names = tuple(feature_names)
+
+    start = time.perf_counter()
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        futures = {
+            job: executor.submit(train_title_model, job, X[rows_by_title[job]], y[rows_by_title[job]],
+                                 feature_names, params, n_jobs)
+            for job in job_titles
+        }
+        models = {job: future.result() for job, future in futures.items()}
+    elapsed = time.perf_counter() - start
+
+    for job, result in models.items():
+        print(f"{job}: {result['rows']} rows, {len(result['skills'])} skills, trained in {result['seconds']:.2f}s")
+    print(f"✅ Trained {len(models)} models in {elapsed:.2f}s ({workers} workers x {n_jobs} jobs per forest)")
+    return models
+
+def top_features(result, k=5):
+    """Returns the `k` most important skills of a trained title model as a Feature/Importance DataFrame."""
+    feature_importances_df = pd.DataFrame({
+        'Feature': result['skills'],
+        'Importance': result['model'].feature_importances_
+    }).sort_values(by='Importance', ascending=False)
+    return feature_importances_df.head(k)
+
+def main():
+    from features import SkillVocabulary, build_skill_matrix, rows_by_value
+
+    parser = argparse.ArgumentParser(description="Train the per-title salary models in parallel.")
+    parser.add_argument("file", nargs="?", default='filtered_data.csv', help="CSV file with Title, Skills and Salary")
+    parser.add_argument("--titles", nargs="+", default=['Software Engineering', 'Data Scientist', 'AI/ML'])
+    parser.add_argument("--processes", action="store_true", help="Train each title in its own process")
+    parser.add_argument("--cores", type=int, default=None, help="Cores to use (default: all)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.file).dropna()
+    df['Title'] = df['Title'].str.strip()
+    df = df[df['Title'].isin(args.titles)]
+    skill_lists = [[skill.strip() for skill in skills.split(';') if skill.strip()] for skills in df['Skills']]
+
+    vocab = SkillVocabulary()
+    X = build_skill_matrix(skill_lists, vocab)
+    models = train_title_models(X, df['Salary'].to_numpy(), rows_by_value(df['Title']), vocab.skills,
+                                args.titles, use_processes=args.processes, cores=args.cores)
+    for job, result in models.items():
+        print(f"\nTop 5 Features for {job} Salary Prediction:")
+        print(top_features(result))
+
+if __name__ == "__main__":
+    main()